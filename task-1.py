@@ -1,5 +1,11 @@
+import heapq
+import sys
+from array import array
+from itertools import islice
 
 class Node:
+    __slots__ = ("data", "next")
+
     def __init__(self, data):
         self.data = data
         self.next = None
@@ -7,28 +13,119 @@ class Node:
 class LinkedList:
     def __init__(self):
         self.head = None
+        self.tail = None
+        self.size = 0
+
+    @classmethod
+    def from_iterable(cls, values):
+        """Build a list from any iterable in a single linear pass"""
+        llist = cls()
+        llist.extend(values)
+        return llist
 
     def append(self, data):
         new_node = Node(data)
         if not self.head:
             self.head = new_node
+        else:
+            self.tail.next = new_node
+        self.tail = new_node
+        self.size += 1
+
+    def extend(self, values):
+        """Append all values, linking the new nodes into one chain first"""
+        chain_head = None
+        chain_tail = None
+        count = 0
+        for value in values:
+            new_node = Node(value)
+            if chain_tail is None:
+                chain_head = new_node
+            else:
+                chain_tail.next = new_node
+            chain_tail = new_node
+            count += 1
+
+        if chain_head is None:
             return
-        current = self.head
-        while current.next:
+        if self.head is None:
+            self.head = chain_head
+        else:
+            self.tail.next = chain_head
+        self.tail = chain_tail
+        self.size += count
+
+    def _relink(self, head):
+        """Reset head, tail and size after nodes were relinked in place"""
+        self.head = head
+        self.tail = None
+        self.size = 0
+        current = head
+        while current:
+            self.tail = current
+            self.size += 1
             current = current.next
-        current.next = new_node
 
-    def print_list(self):
+    def __iter__(self):
         current = self.head
         while current:
-            print(current.data, end=" -> ")
+            yield current.data
             current = current.next
-        print("None")
+
+    def __len__(self):
+        return self.size
+
+    def window(self, start, stop=None, step=1):
+        """Lazy slice-style view over the values, e.g. window(10, 20)"""
+        return islice(self, start, stop, step)
+
+    def write_to(self, stream, sep=" -> ", end="\n", chunk_size=65536):
+        """Write all values to a text stream, joining chunk_size values per write"""
+        values = iter(self)
+        chunk = [str(value) for value in islice(values, chunk_size)]
+        while chunk:
+            stream.write(sep.join(chunk))
+            chunk = [str(value) for value in islice(values, chunk_size)]
+            if chunk:
+                stream.write(sep)
+        stream.write(end)
+
+    def print_list(self):
+        self.write_to(sys.stdout, end=" -> None\n" if self.head else "None\n")
+
+    def dump(self, path, typecode=None):
+        """
+        Save the values to path: one value per line by default, or as a raw
+        binary array of the given typecode (e.g. "q", "d") for numeric data.
+        """
+        if typecode is None:
+            with open(path, "w") as f:
+                self.write_to(f, sep="\n", end="\n" if self.head else "")
+        else:
+            with open(path, "wb") as f:
+                values = iter(self)
+                while True:
+                    chunk = array(typecode, islice(values, 65536))
+                    if not chunk:
+                        break
+                    chunk.tofile(f)
+
+    @classmethod
+    def load(cls, path, typecode=None, parse=str):
+        """Load a list saved with dump; parse converts each text line"""
+        if typecode is None:
+            with open(path) as f:
+                return cls.from_iterable(parse(line.rstrip("\n")) for line in f)
+        values = array(typecode)
+        with open(path, "rb") as f:
+            values.frombytes(f.read())
+        return cls.from_iterable(values)
 
     # Task 1.1: Reverse the linked list
     def reverse(self):
         prev = None
         current = self.head
+        self.tail = current
         while current:
             next_node = current.next
             current.next = prev
@@ -49,7 +146,7 @@ class LinkedList:
             sorted_list = self._sorted_insert(sorted_list, current)
             current = next_node
 
-        self.head = sorted_list
+        self._relink(sorted_list)
 
     def _sorted_insert(self, sorted_head, new_node):
         if not sorted_head or sorted_head.data >= new_node.data:
@@ -64,6 +161,135 @@ class LinkedList:
         current.next = new_node
         return sorted_head
 
+    # Task 1.2 (scalable): Bottom-up merge sort for linked list
+    def merge_sort(self, key=None, reverse=False, adaptive=False, min_run=32):
+        """
+        Stable O(n log n) sort that only relinks next pointers.
+        With adaptive=True natural runs are detected and short ones are
+        extended to min_run nodes with insertion sort, as in Timsort.
+        """
+        if not self.head or not self.head.next:
+            return
+
+        # Decorate each node with its key once, so comparisons never call key
+        if key is not None:
+            keys = [key(data) for data in self]
+            node = self.head
+            for node_key in keys:
+                node.data = (node_key, node.data)
+                node = node.next
+            if reverse:
+                def in_order(a, b):
+                    return a.data[0] >= b.data[0]
+            else:
+                def in_order(a, b):
+                    return a.data[0] <= b.data[0]
+        elif reverse:
+            def in_order(a, b):
+                return a.data >= b.data
+        else:
+            def in_order(a, b):
+                return a.data <= b.data
+
+        # pending[i] holds a sorted run built from 2**i base runs (or None)
+        pending = []
+        current = self.head
+        while current:
+            if adaptive:
+                run, current = self._take_run(current, in_order, min_run)
+            else:
+                run, current = current, current.next
+                run.next = None
+
+            i = 0
+            while i < len(pending) and pending[i] is not None:
+                run = self._merge_runs(pending[i], run, in_order)
+                pending[i] = None
+                i += 1
+            if i == len(pending):
+                pending.append(run)
+            else:
+                pending[i] = run
+
+        # Lower slots hold later runs, so merge them in as the right side
+        result = None
+        for run in pending:
+            if run is not None:
+                result = run if result is None else self._merge_runs(run, result, in_order)
+
+        self._relink(result)
+        if key is not None:
+            node = self.head
+            while node:
+                node.data = node.data[1]
+                node = node.next
+
+    @staticmethod
+    def _merge_runs(left, right, in_order):
+        """Stably merge two sorted node chains, preferring left on ties"""
+        if in_order(left, right):
+            head = tail = left
+            left = left.next
+        else:
+            head = tail = right
+            right = right.next
+
+        while left and right:
+            if in_order(left, right):
+                tail.next = left
+                tail = left
+                left = left.next
+            else:
+                tail.next = right
+                tail = right
+                right = right.next
+
+        tail.next = left or right
+        return head
+
+    @staticmethod
+    def _take_run(start, in_order, min_run):
+        """Detach a sorted run starting at start, return (run_head, next_node)"""
+        run_head = run_tail = start
+        current = start.next
+        length = 1
+
+        if current and not in_order(start, current):
+            # Strictly descending run: reverse it while walking
+            start.next = None
+            while current and not in_order(run_head, current):
+                next_node = current.next
+                current.next = run_head
+                run_head = current
+                current = next_node
+                length += 1
+        else:
+            while current and in_order(run_tail, current):
+                run_tail = current
+                current = current.next
+                length += 1
+
+        # Extend a short run with insertion sort
+        while current and length < min_run:
+            next_node = current.next
+            if in_order(run_tail, current):
+                run_tail.next = current
+                run_tail = current
+            elif not in_order(run_head, current):
+                current.next = run_head
+                run_head = current
+            else:
+                prev = run_head
+                while in_order(prev.next, current):
+                    prev = prev.next
+                current.next = prev.next
+                prev.next = current
+            current = next_node
+            length += 1
+
+        run_tail.next = None
+        return run_head, current
+
     # Task 1.3: Merge two sorted linked lists
     @staticmethod
     def merge_sorted_lists(list1, list2):
@@ -71,6 +297,11 @@ class LinkedList:
         current1 = list1.head
         current2 = list2.head
 
+        def remaining(current):
+            while current:
+                yield current.data
+                current = current.next
+
         while current1 and current2:
             if current1.data <= current2.data:
                 merged_list.append(current1.data)
@@ -79,18 +310,210 @@ class LinkedList:
                 merged_list.append(current2.data)
                 current2 = current2.next
 
-        # Add remaining elements from list1, if any
-        while current1:
-            merged_list.append(current1.data)
-            current1 = current1.next
+        # Add remaining elements from list1 or list2, if any
+        merged_list.extend(remaining(current1 or current2))
+
+        return merged_list
+
+    @staticmethod
+    def merge_k_sorted_lists(lists):
+        """
+        Merge any number of sorted lists by splicing their existing nodes.
+        No nodes are copied; the source lists are left empty.
+        """
+        heap = [(llist.head.data, i, llist.head) for i, llist in enumerate(lists) if llist.head]
+        heapq.heapify(heap)
 
-        # Add remaining elements from list2, if any
-        while current2:
-            merged_list.append(current2.data)
-            current2 = current2.next
+        merged_list = LinkedList()
+        tail = None
+        count = 0
+        while heap:
+            _, i, node = heap[0]
+            if node.next:
+                heapq.heapreplace(heap, (node.next.data, i, node.next))
+            else:
+                heapq.heappop(heap)
 
+            if tail is None:
+                merged_list.head = node
+            else:
+                tail.next = node
+            tail = node
+            count += 1
+
+        if tail:
+            tail.next = None
+        merged_list.tail = tail
+        merged_list.size = count
+
+        for llist in lists:
+            llist.head = llist.tail = None
+            llist.size = 0
+
+        return merged_list
+
+    @staticmethod
+    def iter_merged(*iterables, key=None):
+        """Lazily yield values merged from any number of sorted iterables"""
+        return heapq.merge(*iterables, key=key)
+
+class ArrayLinkedList:
+    """
+    Compact linked list: node values and next indices live in parallel
+    typed arrays, -1 stands for None, and removed slots are reused
+    through a free list threaded over the next array.
+    """
+
+    def __init__(self, typecode="q"):
+        self.data = array(typecode)
+        self.next = array("q")
+        self.head = -1
+        self.tail = -1
+        self.free = -1
+        self.size = 0
+
+    @classmethod
+    def from_iterable(cls, values, typecode="q"):
+        llist = cls(typecode)
+        llist.extend(values)
+        return llist
+
+    def _new_node(self, data):
+        if self.free != -1:
+            index = self.free
+            self.free = self.next[index]
+            self.data[index] = data
+            self.next[index] = -1
+        else:
+            index = len(self.data)
+            self.data.append(data)
+            self.next.append(-1)
+        return index
+
+    def append(self, data):
+        index = self._new_node(data)
+        if self.head == -1:
+            self.head = index
+        else:
+            self.next[self.tail] = index
+        self.tail = index
+        self.size += 1
+
+    def extend(self, values):
+        for value in values:
+            self.append(value)
+
+    def remove(self, data):
+        """Unlink the first node holding data and put its slot on the free list"""
+        prev = -1
+        current = self.head
+        while current != -1 and self.data[current] != data:
+            prev = current
+            current = self.next[current]
+        if current == -1:
+            raise ValueError(f"{data} not in list")
+
+        following = self.next[current]
+        if prev == -1:
+            self.head = following
+        else:
+            self.next[prev] = following
+        if current == self.tail:
+            self.tail = prev
+
+        self.next[current] = self.free
+        self.free = current
+        self.size -= 1
+
+    def __iter__(self):
+        current = self.head
+        while current != -1:
+            yield self.data[current]
+            current = self.next[current]
+
+    def __len__(self):
+        return self.size
+
+    def print_list(self):
+        print("".join(f"{value} -> " for value in self) + "None")
+
+    def reverse(self):
+        prev = -1
+        current = self.head
+        self.tail = current
+        while current != -1:
+            next_node = self.next[current]
+            self.next[current] = prev
+            prev = current
+            current = next_node
+        self.head = prev
+
+    def insertion_sort(self):
+        if self.head == -1 or self.next[self.head] == -1:
+            return
+
+        data = self.data
+        nxt = self.next
+        sorted_head = -1
+        current = self.head
+
+        while current != -1:
+            next_node = nxt[current]
+            if sorted_head == -1 or data[sorted_head] >= data[current]:
+                nxt[current] = sorted_head
+                sorted_head = current
+            else:
+                node = sorted_head
+                while nxt[node] != -1 and data[nxt[node]] < data[current]:
+                    node = nxt[node]
+                nxt[current] = nxt[node]
+                nxt[node] = current
+            current = next_node
+
+        self.head = sorted_head
+        node = sorted_head
+        while nxt[node] != -1:
+            node = nxt[node]
+        self.tail = node
+
+    @staticmethod
+    def merge_sorted_lists(list1, list2):
+        merged_list = ArrayLinkedList(list1.data.typecode)
+        merged_list.extend(heapq.merge(list1, list2))
         return merged_list
 
+def benchmark_build(sizes=(10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6)):
+    """Time append/from_iterable for growing sizes to show linear scaling"""
+    import time
+
+    print(f"{'Size':>10} {'append (s)':>12} {'from_iterable (s)':>18} {'ns/item':>9}")
+    for n in sizes:
+        start = time.perf_counter()
+        llist = LinkedList()
+        for i in range(n):
+            llist.append(i)
+        append_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        LinkedList.from_iterable(range(n))
+        bulk_time = time.perf_counter() - start
+
+        print(f"{n:>10} {append_time:>12.4f} {bulk_time:>18.4f} {bulk_time / n * 1e9:>9.1f}")
+
+def benchmark_memory(n=10 ** 6):
+    """Compare allocated memory of the node object graph and ArrayLinkedList"""
+    import tracemalloc
+
+    for name, build in (("LinkedList", LinkedList.from_iterable),
+                        ("ArrayLinkedList", ArrayLinkedList.from_iterable)):
+        tracemalloc.start()
+        llist = build(range(n))
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{name:<16} {n:>10} nodes: {current / 2 ** 20:8.1f} MiB "
+              f"({current / n:.1f} bytes/node)")
+        del llist
+
 # Example usage:
 def test_linked_list():
     # Test reversal
@@ -113,6 +536,11 @@ def test_linked_list():
     print("Sorted list:")
     unsorted_list.print_list()
 
+    big_list = LinkedList.from_iterable([7, 3, 9, 1, 5, 8, 2, 6, 4])
+    big_list.merge_sort(reverse=True, adaptive=True)
+    print("Merge sorted list (descending):")
+    big_list.print_list()
+
     # Test merging
     list1 = LinkedList()
     list2 = LinkedList()
@@ -128,5 +556,11 @@ def test_linked_list():
     print("Merged list:")
     merged.print_list()
 
+    shards = [LinkedList.from_iterable(range(start, 12, 3)) for start in range(3)]
+    print("Lazily merged shards:", list(LinkedList.iter_merged(*shards)))
+    merged = LinkedList.merge_k_sorted_lists(shards)
+    print("K-way merged list:")
+    merged.print_list()
+
 if __name__ == "__main__":
     test_linked_list()
\ No newline at end of file
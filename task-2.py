@@ -1,6 +1,10 @@
 
+import sys
 import turtle
 import math
+from functools import lru_cache
+import numpy as np
+import matplotlib.image as mpimg
 
 def draw_pythagoras_tree(t, size, level):
     if level == 0:
@@ -51,16 +55,287 @@ def draw_pythagoras_tree(t, size, level):
     t.setheading(save_heading)
     t.pendown()
 
-def setup_turtle():
+# Headless engine: every square is an affine frame (origin, side vector) and
+# each level is computed at once as NumPy arrays, mirroring the turtle moves
+# in draw_pythagoras_tree without drawing anything.
+BRANCH_SCALE = 1 / math.sqrt(2)
+ROTATE_45 = np.array([[math.cos(math.pi / 4), -math.sin(math.pi / 4)],
+                      [math.sin(math.pi / 4), math.cos(math.pi / 4)]])
+CHUNK_SQUARES = 65536
+
+def pythagoras_levels(size, level, start=(0, -200), heading=90):
+    """
+    Yield (origins, sides) for each recursion level: origins[i] is the corner
+    the turtle starts square i from and sides[i] is its first side vector.
+    Level k holds 2**k squares.
+    """
+    angle = math.radians(heading)
+    origins = np.array([start], dtype=float)
+    sides = np.array([[size * math.cos(angle), size * math.sin(angle)]])
+
+    for _ in range(level):
+        yield origins, sides
+
+        normals = np.column_stack((-sides[:, 1], sides[:, 0]))
+        branch_sides = sides @ ROTATE_45.T * BRANCH_SCALE
+
+        # Right branch starts after the first side, left branch after the second
+        right_origins = origins + sides
+        left_origins = right_origins + normals
+        origins = np.concatenate((right_origins, left_origins))
+        sides = np.concatenate((branch_sides, branch_sides))
+
+def square_corners(origins, sides):
+    """Return an (n, 4, 2) array with the corners of each square in drawing order"""
+    normals = np.column_stack((-sides[:, 1], sides[:, 0]))
+    return np.stack((origins,
+                     origins + sides,
+                     origins + sides + normals,
+                     origins + normals), axis=1)
+
+def tree_bounds(size, level):
+    """Return (min_x, min_y, max_x, max_y) of the whole tree"""
+    low = np.full(2, np.inf)
+    high = np.full(2, -np.inf)
+    for origins, sides in pythagoras_levels(size, level):
+        corners = square_corners(origins, sides).reshape(-1, 2)
+        low = np.minimum(low, corners.min(axis=0))
+        high = np.maximum(high, corners.max(axis=0))
+    return low[0], low[1], high[0], high[1]
+
+def save_svg(path, size, level, color="green", stroke_width=0.5):
+    """Write the tree as SVG with one path element per recursion level"""
+    min_x, min_y, max_x, max_y = tree_bounds(size, level)
+    width, height = max_x - min_x, max_y - min_y
+    square_format = "M%.3f %.3fL%.3f %.3fL%.3f %.3fL%.3f %.3fZ"
+
+    with open(path, "w") as f:
+        f.write('<svg xmlns="http://www.w3.org/2000/svg" '
+                f'viewBox="{min_x:.3f} {-max_y:.3f} {width:.3f} {height:.3f}">\n')
+        f.write(f'<g transform="scale(1,-1)" fill="none" stroke="{color}" '
+                f'stroke-width="{stroke_width}">\n')
+        for origins, sides in pythagoras_levels(size, level):
+            f.write('<path d="')
+            for start in range(0, len(origins), CHUNK_SQUARES):
+                stop = start + CHUNK_SQUARES
+                corners = square_corners(origins[start:stop], sides[start:stop])
+                f.write((square_format * len(corners)) % tuple(corners.ravel()))
+            f.write('"/>\n')
+        f.write('</g>\n</svg>\n')
+
+def render_raster(size, level, width=2048, color=(0, 128, 0)):
+    """Rasterize the square outlines into an RGB uint8 array"""
+    min_x, min_y, max_x, max_y = tree_bounds(size, level)
+    scale = (width - 1) / (max_x - min_x)
+    height = int((max_y - min_y) * scale) + 1
+    image = np.full((height, width, 3), 255, dtype=np.uint8)
+
+    for origins, sides in pythagoras_levels(size, level):
+        rasterize_squares(image, origins, sides, min_x, max_y, scale, color)
+
+    return image
+
+def rasterize_squares(image, origins, sides, min_x, max_y, scale, color):
+    """Draw square outlines into image, world point (min_x, max_y) is pixel (0, 0)"""
+    height, width = image.shape[:2]
+
+    # Group squares by power-of-two pixel size so every edge is sampled about
+    # once per pixel without oversampling small squares
+    side_pixels = np.hypot(sides[:, 0], sides[:, 1]) * scale
+    buckets = np.ceil(np.log2(np.maximum(side_pixels, 1))).astype(np.intp)
+    for bucket in np.unique(buckets):
+        selected = np.flatnonzero(buckets == bucket)
+        steps = np.linspace(0, 1, max(2, 2 ** int(bucket) + 1))
+        for start in range(0, len(selected), CHUNK_SQUARES):
+            chunk = selected[start:start + CHUNK_SQUARES]
+            corners = square_corners(origins[chunk], sides[chunk])
+            edges = np.roll(corners, -1, axis=1) - corners
+            points = corners[:, :, None, :] + steps[None, None, :, None] * edges[:, :, None, :]
+            points = points.reshape(-1, 2)
+            xs = np.rint((points[:, 0] - min_x) * scale).astype(np.intp)
+            ys = np.rint((max_y - points[:, 1]) * scale).astype(np.intp)
+            visible = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+            image[ys[visible], xs[visible]] = color
+
+# Instancing: every subtree is a scaled, rotated copy of the tree, so subtree
+# geometry is built once per depth in a unit frame (origin (0, 0), first side
+# (1, 0)) and placed with an affine transform. CHILD_FRAMES are the frames of
+# the two branches inside that unit frame, matching pythagoras_levels.
+CHILD_FRAMES = ((np.array([1.0, 0.0]), np.array([0.5, 0.5])),
+                (np.array([1.0, 1.0]), np.array([0.5, 0.5])))
+INSTANCE_DEPTH = 12
+SUPPORT_DIRECTIONS = 8
+SUPPORT_STEP = 2 * math.pi / SUPPORT_DIRECTIONS
+
+def to_world(local_origins, local_sides, origin, side):
+    """Map squares given in the unit frame into the frame (origin, side)"""
+    normal = np.array([-side[1], side[0]])
+    origins = origin + local_origins[:, :1] * side + local_origins[:, 1:] * normal
+    sides = local_sides[:, :1] * side + local_sides[:, 1:] * normal
+    return origins, sides
+
+@lru_cache(maxsize=None)
+def subtree_instance(depth):
+    """(origins, sides) of all squares of a depth-level subtree in the unit frame"""
+    origins = [np.zeros((1, 2))]
+    sides = [np.array([[1.0, 0.0]])]
+    if depth > 1:
+        child_origins, child_sides = subtree_instance(depth - 1)
+        for frame_origin, frame_side in CHILD_FRAMES:
+            placed_origins, placed_sides = to_world(child_origins, child_sides,
+                                                    frame_origin, frame_side)
+            origins.append(placed_origins)
+            sides.append(placed_sides)
+    return np.concatenate(origins), np.concatenate(sides)
+
+def _support_bound(support, angle):
+    """
+    Upper bound of a support function sampled every SUPPORT_STEP radians;
+    exact on the sample directions.
+    """
+    position = (angle / SUPPORT_STEP) % SUPPORT_DIRECTIONS
+    k = int(round(position))
+    if abs(position - k) < 1e-9:
+        return support[k % SUPPORT_DIRECTIONS]
+    k = int(position)
+    offset = (position - k) * SUPPORT_STEP
+    return (support[k] * math.sin(SUPPORT_STEP - offset)
+            + support[(k + 1) % SUPPORT_DIRECTIONS] * math.sin(offset)) / math.sin(SUPPORT_STEP)
+
+@lru_cache(maxsize=None)
+def subtree_support(depth):
+    """
+    Support function of a depth-level subtree in the unit frame, sampled in
+    SUPPORT_DIRECTIONS directions, built from the child subtrees without
+    generating any squares.
+    """
+    directions = [(math.cos(k * SUPPORT_STEP), math.sin(k * SUPPORT_STEP))
+                  for k in range(SUPPORT_DIRECTIONS)]
+    corners = ((0, 0), (1, 0), (1, 1), (0, 1))
+    support = [max(x * dx + y * dy for x, y in corners) for dx, dy in directions]
+
+    if depth > 1:
+        child_support = subtree_support(depth - 1)
+        for frame_origin, frame_side in CHILD_FRAMES:
+            scale = math.hypot(*frame_side)
+            rotation = math.atan2(frame_side[1], frame_side[0])
+            for k, (dx, dy) in enumerate(directions):
+                value = (frame_origin[0] * dx + frame_origin[1] * dy
+                         + scale * _support_bound(child_support, k * SUPPORT_STEP - rotation))
+                support[k] = max(support[k], value)
+
+    return tuple(support)
+
+def subtree_bounds(origin, side, depth):
+    """World (min_x, min_y, max_x, max_y) of a subtree placed at frame (origin, side)"""
+    support = subtree_support(depth)
+    scale = math.hypot(side[0], side[1])
+    rotation = math.atan2(side[1], side[0])
+    extent = [scale * _support_bound(support, k * math.pi / 2 - rotation) for k in range(4)]
+    return (origin[0] - extent[2], origin[1] - extent[3],
+            origin[0] + extent[0], origin[1] + extent[1])
+
+def visible_squares(viewport, pixel_size, size=100, level=40, start=(0, -200), heading=90):
+    """
+    Return (origins, sides) of the squares needed to draw the tree inside
+    viewport = (min_x, min_y, max_x, max_y). Subtrees outside the viewport are
+    culled, recursion stops at squares smaller than pixel_size, and subtrees
+    fully inside the viewport are stamped from the instance cache.
+    """
+    view_min_x, view_min_y, view_max_x, view_max_y = viewport
+    angle = math.radians(heading)
+    stack = [(np.array(start, dtype=float),
+              np.array([size * math.cos(angle), size * math.sin(angle)]), level)]
+    origins = []
+    sides = []
+
+    while stack:
+        origin, side, depth = stack.pop()
+        min_x, min_y, max_x, max_y = subtree_bounds(origin, side, depth)
+        if min_x > view_max_x or max_x < view_min_x or min_y > view_max_y or max_y < view_min_y:
+            continue
+
+        side_length = math.hypot(side[0], side[1])
+        if side_length < pixel_size or depth == 1:
+            origins.append(origin[None, :])
+            sides.append(side[None, :])
+            continue
+
+        # Number of levels whose squares are still at least one pixel wide
+        detail_depth = 1 + int(math.log(pixel_size / side_length) / math.log(BRANCH_SCALE))
+        detail_depth = min(depth, detail_depth)
+        inside = (min_x >= view_min_x and max_x <= view_max_x
+                  and min_y >= view_min_y and max_y <= view_max_y)
+        if inside and detail_depth <= INSTANCE_DEPTH:
+            placed_origins, placed_sides = to_world(*subtree_instance(detail_depth), origin, side)
+            origins.append(placed_origins)
+            sides.append(placed_sides)
+            continue
+
+        origins.append(origin[None, :])
+        sides.append(side[None, :])
+        for frame_origin, frame_side in CHILD_FRAMES:
+            child_origin, child_side = to_world(frame_origin[None, :], frame_side[None, :],
+                                                origin, side)
+            stack.append((child_origin[0], child_side[0], depth - 1))
+
+    if not origins:
+        # Nothing of the tree is inside the viewport
+        return np.empty((0, 2)), np.empty((0, 2))
+    return np.concatenate(origins), np.concatenate(sides)
+
+def render_view(path, viewport, width=1024, size=100, level=40, color=(0, 128, 0)):
+    """Render only the part of a (very deep) tree inside viewport to a raster file"""
+    min_x, min_y, max_x, max_y = viewport
+    scale = (width - 1) / (max_x - min_x)
+    height = int((max_y - min_y) * scale) + 1
+    image = np.full((height, width, 3), 255, dtype=np.uint8)
+    origins, sides = visible_squares(viewport, 1 / scale, size, level)
+    rasterize_squares(image, origins, sides, min_x, max_y, scale, color)
+    mpimg.imsave(path, image)
+    return len(origins)
+
+def render_headless(path, level, size=100, width=2048):
+    """Render the tree to an .svg or raster (.png, .jpg, ...) file without a display"""
+    if path.lower().endswith(".svg"):
+        save_svg(path, size, level)
+    else:
+        mpimg.imsave(path, render_raster(size, level, width))
+
+def draw_pythagoras_tree_fast(t, screen, size, level):
+    """
+    Draw each square as one filled polygon from precomputed corners and
+    refresh the screen once per level instead of after every move.
+    """
+    t.penup()
+    for origins, sides in pythagoras_levels(size, level):
+        for corners in square_corners(origins, sides).tolist():
+            t.goto(corners[0])
+            t.pendown()
+            t.begin_fill()
+            for corner in corners[1:]:
+                t.goto(corner)
+            t.goto(corners[0])
+            t.end_fill()
+            t.penup()
+        screen.update()
+
+def setup_turtle(fast=False):
     # Set up the screen
     screen = turtle.Screen()
     screen.title("Pythagoras Tree Fractal")
     screen.bgcolor("white")
+    if fast:
+        screen.tracer(0)  # Only redraw on explicit screen.update()
 
     # Set up the turtle
     t = turtle.Turtle()
     t.speed(0)  # Fastest speed
-    t.color("green")
+    if fast:
+        t.hideturtle()
+        t.color("darkgreen", "green")
+    else:
+        t.color("green")
     t.left(90)  # Point upward
 
     # Move to starting position
@@ -71,15 +346,26 @@ def setup_turtle():
     return t, screen
 
 def main():
-    # Get recursion level from user
-    level = int(input("Enter the recursion level (1-10): "))
-    level = max(1, min(10, level))  # Limit level between 1 and 10
+    # Headless mode: python task-2.py <level> <output.svg|output.png>
+    if len(sys.argv) == 3:
+        level = max(1, min(22, int(sys.argv[1])))
+        render_headless(sys.argv[2], level)
+        return
+
+    # Get recursion level and drawing mode from user
+    fast = input("Use fast rendering mode? (y/n): ").strip().lower() == "y"
+    max_level = 16 if fast else 10
+    level = int(input(f"Enter the recursion level (1-{max_level}): "))
+    level = max(1, min(max_level, level))  # Limit level between 1 and max_level
 
     # Setup turtle
-    t, screen = setup_turtle()
+    t, screen = setup_turtle(fast)
 
-    # Draw the tree
-    draw_pythagoras_tree(t, 100, level)  # 100 is the size of the base square
+    # Draw the tree (100 is the size of the base square)
+    if fast:
+        draw_pythagoras_tree_fast(t, screen, 100, level)
+    else:
+        draw_pythagoras_tree(t, 100, level)
 
     # Hide turtle and keep window open
     t.hideturtle()
@@ -1,59 +1,259 @@
 import heapq
-from collections import defaultdict
+import mmap
+import multiprocessing
+import os
+import pickle
+import random
+import struct
+import sys
+import time
+import tracemalloc
+from array import array
+from collections import OrderedDict, defaultdict
 
 class Graph:
     def __init__(self):
         self.edges = defaultdict(list)
         self.weights = {}
+        self.version = 0  # Bumped on every change so cached results can be invalidated
 
     def add_edge(self, from_node, to_node, weight):
-        # Add edge to the graph
-        self.edges[from_node].append(to_node)
-        self.edges[to_node].append(from_node)  # For undirected graph
+        self.version += 1
+        # Add edge to the graph (re-adding an edge only updates its weight)
+        if (from_node, to_node) not in self.weights:
+            self.edges[from_node].append(to_node)
+            self.edges[to_node].append(from_node)  # For undirected graph
         self.weights[(from_node, to_node)] = weight
         self.weights[(to_node, from_node)] = weight  # For undirected graph
 
-def dijkstra(graph, initial):
+def dijkstra(graph, initial, queue="auto"):
+    """
+    Shortest path tree from initial; returns (distances, previous).
+    The priority queue is picked by choose_queue unless given, see
+    dijkstra_with_queue.
+    """
+    distances, previous, _ = dijkstra_with_queue(graph, initial, queue)
+    return distances, previous
+
+# Priority queues for dijkstra_with_queue. All share push(priority, item),
+# pop() -> (priority, item), len() and an operations counter. The lazy queues
+# may hold stale duplicates, which dijkstra skips through its visited set.
+class HeapQueue:
+    """Plain heapq with lazy deletion, as used by dijkstra"""
+
+    def __init__(self):
+        self.heap = []
+        self.operations = {"push": 0, "pop": 0}
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, priority, item):
+        self.operations["push"] += 1
+        heapq.heappush(self.heap, (priority, item))
+
+    def pop(self):
+        self.operations["pop"] += 1
+        return heapq.heappop(self.heap)
+
+class BucketQueue:
+    """
+    Dial's algorithm: a circular array of max_weight + 1 buckets. Needs
+    integer priorities and monotone pops, which dijkstra guarantees.
+    """
+
+    def __init__(self, max_weight):
+        self.buckets = [[] for _ in range(max_weight + 1)]
+        self.cursor = 0
+        self.size = 0
+        self.operations = {"push": 0, "pop": 0, "bucket_scan": 0}
+
+    def __len__(self):
+        return self.size
+
+    def push(self, priority, item):
+        self.operations["push"] += 1
+        self.buckets[priority % len(self.buckets)].append((priority, item))
+        self.size += 1
+
+    def pop(self):
+        self.operations["pop"] += 1
+        while not self.buckets[self.cursor]:
+            self.operations["bucket_scan"] += 1
+            self.cursor = (self.cursor + 1) % len(self.buckets)
+        self.size -= 1
+        return self.buckets[self.cursor].pop()
+
+class RadixHeap:
+    """
+    Monotone integer priority queue: an entry goes to the bucket of the
+    highest bit in which its priority differs from the last popped one,
+    so each entry moves between buckets at most O(log C) times. Buckets
+    are added as needed for priorities wider than 64 bits.
+    """
+
+    def __init__(self):
+        self.buckets = [[] for _ in range(65)]
+        self.last = 0
+        self.size = 0
+        self.operations = {"push": 0, "pop": 0, "redistribute": 0}
+
+    def __len__(self):
+        return self.size
+
+    def push(self, priority, item):
+        self.operations["push"] += 1
+        bucket = (priority ^ self.last).bit_length()
+        if bucket >= len(self.buckets):
+            self.buckets.extend([] for _ in range(bucket + 1 - len(self.buckets)))
+        self.buckets[bucket].append((priority, item))
+        self.size += 1
+
+    def pop(self):
+        self.operations["pop"] += 1
+        if not self.buckets[0]:
+            i = 1
+            while not self.buckets[i]:
+                i += 1
+            entries = self.buckets[i]
+            self.buckets[i] = []
+            self.last = min(entries)[0]
+            for entry in entries:
+                self.operations["redistribute"] += 1
+                self.buckets[(entry[0] ^ self.last).bit_length()].append(entry)
+        self.size -= 1
+        return self.buckets[0].pop()
+
+class IndexedBinaryHeap:
+    """Binary heap with a position index, so push() on a queued item is a real decrease-key"""
+
+    def __init__(self):
+        self.heap = []        # list of [priority, item]
+        self.position = {}    # item -> index in heap
+        self.operations = {"push": 0, "pop": 0, "decrease_key": 0}
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, priority, item):
+        index = self.position.get(item)
+        if index is None:
+            self.operations["push"] += 1
+            self.heap.append([priority, item])
+            index = len(self.heap) - 1
+            self.position[item] = index
+        elif priority < self.heap[index][0]:
+            self.operations["decrease_key"] += 1
+            self.heap[index][0] = priority
+        else:
+            return
+        self._sift_up(index)
+
+    def pop(self):
+        self.operations["pop"] += 1
+        heap = self.heap
+        top = heap[0]
+        last = heap.pop()
+        del self.position[top[1]]
+        if heap:
+            heap[0] = last
+            self.position[last[1]] = 0
+            self._sift_down(0)
+        return top[0], top[1]
+
+    def _sift_up(self, index):
+        heap, position = self.heap, self.position
+        entry = heap[index]
+        while index > 0:
+            parent = (index - 1) // 2
+            if heap[parent][0] <= entry[0]:
+                break
+            heap[index] = heap[parent]
+            position[heap[index][1]] = index
+            index = parent
+        heap[index] = entry
+        position[entry[1]] = index
+
+    def _sift_down(self, index):
+        heap, position = self.heap, self.position
+        entry = heap[index]
+        size = len(heap)
+        while True:
+            child = 2 * index + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap[child + 1][0] < heap[child][0]:
+                child += 1
+            if entry[0] <= heap[child][0]:
+                break
+            heap[index] = heap[child]
+            position[heap[index][1]] = index
+            index = child
+        heap[index] = entry
+        position[entry[1]] = index
+
+def choose_queue(graph):
+    """Pick a priority queue from the edge weights of graph"""
+    weights = graph.weights.values()
+    if weights and all(isinstance(w, int) and w >= 0 for w in weights):
+        max_weight = max(weights)
+        # Dial's buckets pay off while a sweep over them is cheap next to the graph size
+        if max_weight <= len(graph.edges):
+            return BucketQueue(max_weight)
+        return RadixHeap()
+    # The pure-Python indexed heap does fewer operations but loses to heapq on time
+    return HeapQueue()
+
+def dijkstra_with_queue(graph, initial, queue="auto"):
+    """
+    Dijkstra with a pluggable priority queue: "auto", "heapq", "bucket",
+    "radix", "indexed" or a queue object. Returns (distances, previous,
+    operations) where operations counts the queue operations performed.
+    """
+    if queue == "auto":
+        queue = choose_queue(graph)
+    elif queue == "heapq":
+        queue = HeapQueue()
+    elif queue == "bucket":
+        queue = BucketQueue(max(graph.weights.values(), default=0))
+    elif queue == "radix":
+        queue = RadixHeap()
+    elif queue == "indexed":
+        queue = IndexedBinaryHeap()
+
     # Distances dictionary
     distances = {vertex: float('infinity') for vertex in graph.edges}
     distances[initial] = 0
 
-    # Priority queue of vertices
-    pq = [(0, initial)]
-
     # Previous vertex dictionary for path reconstruction
     previous = {vertex: None for vertex in graph.edges}
 
     # Set of visited vertices
     visited = set()
+    queue.push(0, initial)
 
-    while pq:
+    while queue:
         # Get vertex with minimum distance
-        current_distance, current_vertex = heapq.heappop(pq)
+        current_distance, current_vertex = queue.pop()
 
-        # If we've already visited this vertex, skip it
+        # Lazy queues may return stale entries of visited vertices
         if current_vertex in visited:
             continue
-
-        # Mark vertex as visited
         visited.add(current_vertex)
 
         # Check all adjacent vertices
         for neighbor in graph.edges[current_vertex]:
             if neighbor in visited:
                 continue
-
-            # Calculate new distance to neighbor
-            weight = graph.weights[(current_vertex, neighbor)]
-            distance = current_distance + weight
+            distance = current_distance + graph.weights[(current_vertex, neighbor)]
 
             # If we've found a shorter path, update it
             if distance < distances[neighbor]:
                 distances[neighbor] = distance
                 previous[neighbor] = current_vertex
-                heapq.heappush(pq, (distance, neighbor))
+                queue.push(distance, neighbor)
 
-    return distances, previous
+    return distances, previous, queue.operations
 
 def get_path(previous, target):
     """Reconstruct path from source to target using previous dictionary"""
@@ -66,6 +266,950 @@ def get_path(previous, target):
 
     return path[::-1]  # Reverse path to get it from source to target
 
+class ShortestPathCache:
+    """
+    Bounded LRU cache of dijkstra results keyed by source vertex. Any change
+    to the graph (tracked through Graph.version) invalidates every cached
+    tree. max_bytes bounds the approximate size of the cached dictionaries.
+    """
+
+    def __init__(self, graph, max_entries=64, max_bytes=None):
+        self.graph = graph
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # source -> (distances, previous, size)
+        self.version = graph.version
+        self.bytes = 0
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def tree(self, source):
+        """Return (distances, previous) for source, computing it on a miss"""
+        if self.graph.version != self.version:
+            self.stats["invalidations"] += len(self.entries)
+            self.clear()
+            self.version = self.graph.version
+
+        entry = self.entries.get(source)
+        if entry is not None:
+            self.stats["hits"] += 1
+            self.entries.move_to_end(source)
+            return entry[0], entry[1]
+
+        self.stats["misses"] += 1
+        distances, previous = dijkstra(self.graph, source)
+        size = sys.getsizeof(distances) + sys.getsizeof(previous)
+        self.entries[source] = (distances, previous, size)
+        self.bytes += size
+
+        while self.entries and (len(self.entries) > self.max_entries or
+                                (self.max_bytes is not None and self.bytes > self.max_bytes)):
+            _, (_, _, evicted_size) = self.entries.popitem(last=False)
+            self.bytes -= evicted_size
+            self.stats["evictions"] += 1
+
+        return distances, previous
+
+    def distance(self, source, target):
+        return self.tree(source)[0][target]
+
+    def path(self, source, target):
+        return get_path(self.tree(source)[1], target)
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+class DynamicSSSP:
+    """
+    Keeps a single-source dijkstra result (distances, previous) up to date
+    while edges are added or reweighted, repairing only the part of the
+    shortest path tree that the change can affect. children mirrors
+    previous so the subtree below an edge is found without a full scan.
+    """
+
+    def __init__(self, graph, source, distances=None, previous=None):
+        self.graph = graph
+        self.source = source
+        if distances is None:
+            distances, previous = dijkstra(graph, source)
+        self.distances = distances
+        self.previous = previous
+        self.children = defaultdict(set)
+        for vertex, parent in previous.items():
+            if parent is not None:
+                self.children[parent].add(vertex)
+
+    def add_edge(self, from_node, to_node, weight):
+        """Add or reweight an edge in the graph; returns how many vertices were updated"""
+        old_weight = self.graph.weights.get((from_node, to_node))
+        self.graph.add_edge(from_node, to_node, weight)
+        for node in (from_node, to_node):
+            self.distances.setdefault(node, float('infinity'))
+            self.previous.setdefault(node, None)
+
+        if old_weight is None or weight < old_weight:
+            return self._decrease(from_node, to_node, weight)
+        if weight > old_weight:
+            return self._increase(from_node, to_node)
+        return 0
+
+    def _set_parent(self, vertex, parent):
+        """Update previous[vertex] and the children index together"""
+        old_parent = self.previous[vertex]
+        if old_parent is not None:
+            self.children[old_parent].discard(vertex)
+        if parent is not None:
+            self.children[parent].add(vertex)
+        self.previous[vertex] = parent
+
+    def _decrease(self, from_node, to_node, weight):
+        distances = self.distances
+        pq = []
+        for u, v in ((from_node, to_node), (to_node, from_node)):
+            if distances[u] + weight < distances[v]:
+                distances[v] = distances[u] + weight
+                self._set_parent(v, u)
+                pq.append((distances[v], v))
+        return self._propagate(pq)
+
+    def _increase(self, from_node, to_node):
+        distances, previous = self.distances, self.previous
+        if previous[to_node] == from_node:
+            root = to_node
+        elif previous[from_node] == to_node:
+            root = from_node
+        else:
+            return 0  # Not a tree edge: no shortest path used it
+
+        # Every vertex below root in the tree may get longer paths
+        affected = [root]
+        for vertex in affected:
+            affected.extend(self.children[vertex])
+        affected_set = set(affected)
+
+        for vertex in affected:
+            distances[vertex] = float('infinity')
+            self._set_parent(vertex, None)
+
+        # Reconnect the affected vertices through their unaffected neighbours
+        pq = []
+        for vertex in affected:
+            for neighbor in self.graph.edges[vertex]:
+                if neighbor in affected_set:
+                    continue
+                distance = distances[neighbor] + self.graph.weights[(neighbor, vertex)]
+                if distance < distances[vertex]:
+                    distances[vertex] = distance
+                    self._set_parent(vertex, neighbor)
+            if distances[vertex] < float('infinity'):
+                pq.append((distances[vertex], vertex))
+
+        self._propagate(pq)
+        return len(affected)
+
+    def _propagate(self, pq):
+        """Dijkstra continued from the given (distance, vertex) seeds"""
+        distances = self.distances
+        heapq.heapify(pq)
+        updated = set(vertex for _, vertex in pq)
+        while pq:
+            current_distance, current_vertex = heapq.heappop(pq)
+            if current_distance > distances[current_vertex]:
+                continue
+            for neighbor in self.graph.edges[current_vertex]:
+                distance = current_distance + self.graph.weights[(current_vertex, neighbor)]
+                if distance < distances[neighbor]:
+                    distances[neighbor] = distance
+                    self._set_parent(neighbor, current_vertex)
+                    updated.add(neighbor)
+                    heapq.heappush(pq, (distance, neighbor))
+        return len(updated)
+
+def shortest_path(graph, source, target):
+    """
+    Dijkstra that stops as soon as target is settled.
+    Returns (distance, path, settled_count); distance is infinity and path
+    is empty when target is unreachable.
+    """
+    distances = {source: 0}
+    previous = {source: None}
+    visited = set()
+    pq = [(0, source)]
+
+    while pq:
+        current_distance, current_vertex = heapq.heappop(pq)
+        if current_vertex in visited:
+            continue
+        visited.add(current_vertex)
+        if current_vertex == target:
+            return current_distance, get_path(previous, target), len(visited)
+
+        for neighbor in graph.edges[current_vertex]:
+            if neighbor in visited:
+                continue
+            distance = current_distance + graph.weights[(current_vertex, neighbor)]
+            if distance < distances.get(neighbor, float('infinity')):
+                distances[neighbor] = distance
+                previous[neighbor] = current_vertex
+                heapq.heappush(pq, (distance, neighbor))
+
+    return float('infinity'), [], len(visited)
+
+def bidirectional_dijkstra(graph, source, target):
+    """
+    Run Dijkstra from both ends at once (the graph is undirected) and stop
+    when the two frontiers cannot improve the best meeting point.
+    Returns (distance, path, settled_count) like shortest_path.
+    """
+    if source == target:
+        return 0, [source], 1
+
+    distances = ({source: 0}, {target: 0})
+    previous = ({source: None}, {target: None})
+    visited = (set(), set())
+    queues = ([(0, source)], [(0, target)])
+    best = float('infinity')
+    meeting = None
+
+    while queues[0] and queues[1]:
+        if queues[0][0][0] + queues[1][0][0] >= best:
+            break
+
+        # Expand the side with the smaller frontier
+        side = 0 if len(queues[0]) <= len(queues[1]) else 1
+        current_distance, current_vertex = heapq.heappop(queues[side])
+        if current_vertex in visited[side]:
+            continue
+        visited[side].add(current_vertex)
+
+        other_distances = distances[1 - side]
+        for neighbor in graph.edges[current_vertex]:
+            distance = current_distance + graph.weights[(current_vertex, neighbor)]
+            if distance < distances[side].get(neighbor, float('infinity')):
+                distances[side][neighbor] = distance
+                previous[side][neighbor] = current_vertex
+                heapq.heappush(queues[side], (distance, neighbor))
+            if neighbor in other_distances and distance + other_distances[neighbor] < best:
+                best = distance + other_distances[neighbor]
+                meeting = (current_vertex, neighbor) if side == 0 else (neighbor, current_vertex)
+
+    settled = len(visited[0]) + len(visited[1])
+    if meeting is None:
+        return float('infinity'), [], settled
+
+    # meeting is an edge (u, v): source ~> u from the forward search, v ~> target backward
+    forward_end, backward_start = meeting
+    path = get_path(previous[0], forward_end) + get_path(previous[1], backward_start)[::-1]
+    return best, path, settled
+
+def euclidean_heuristic(coordinates, scale=1.0):
+    """
+    A* heuristic from node coordinates {node: (x, y)}. It is admissible as
+    long as every edge weight is at least scale times the straight-line
+    distance between its endpoints.
+    """
+    def heuristic(vertex, target):
+        x1, y1 = coordinates[vertex]
+        x2, y2 = coordinates[target]
+        return scale * ((x1 - x2) ** 2 + (y1 - y2) ** 2) ** 0.5
+    return heuristic
+
+def astar(graph, source, target, heuristic=None):
+    """
+    A* search guided by an admissible heuristic(vertex, target); without one
+    it is the same as shortest_path. Returns (distance, path, settled_count).
+    A vertex is expanded again when a shorter path to it turns up, which
+    only happens for inconsistent heuristics; settled_count counts every
+    expansion.
+    """
+    if heuristic is None:
+        return shortest_path(graph, source, target)
+
+    distances = {source: 0}
+    previous = {source: None}
+    settled = 0
+    pq = [(heuristic(source, target), 0, source)]
+
+    while pq:
+        _, current_distance, current_vertex = heapq.heappop(pq)
+        # Skip entries superseded by a shorter path
+        if current_distance > distances[current_vertex]:
+            continue
+        settled += 1
+        if current_vertex == target:
+            return current_distance, get_path(previous, target), settled
+
+        for neighbor in graph.edges[current_vertex]:
+            distance = current_distance + graph.weights[(current_vertex, neighbor)]
+            if distance < distances.get(neighbor, float('infinity')):
+                distances[neighbor] = distance
+                previous[neighbor] = current_vertex
+                heapq.heappush(pq, (distance + heuristic(neighbor, target), distance, neighbor))
+
+    return float('infinity'), [], settled
+
+class CSRGraph:
+    """
+    Frozen compressed sparse row copy of a Graph. Vertices are interned to
+    ints: labels[i] is the label of vertex i and index[label] is its number.
+    The neighbours of vertex i are targets[offsets[i]:offsets[i + 1]] with
+    the matching entries of weights.
+    """
+
+    def __init__(self, labels, offsets, targets, weights, path=None, index=None):
+        self.labels = labels
+        self._index = index
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.path = path  # Set when the arrays are memory-mapped from a file
+
+    def __len__(self):
+        return len(self.labels)
+
+    @property
+    def index(self):
+        """label -> vertex number, built on first use when not given up front"""
+        if self._index is None:
+            self._index = {label: i for i, label in enumerate(self.labels)}
+        return self._index
+
+    def __reduce_ex__(self, protocol):
+        # A memory-mapped graph is sent to other processes by path and re-mapped there
+        if self.path is not None:
+            return open_csr, (self.path,)
+        return super().__reduce_ex__(protocol)
+
+    @classmethod
+    def from_graph(cls, graph):
+        labels = list(graph.edges)
+        index = {label: i for i, label in enumerate(labels)}
+        integer_weights = all(isinstance(w, int) for w in graph.weights.values())
+
+        offsets = array("q", [0])
+        targets = array("q")
+        weights = array("q" if integer_weights else "d")
+        for label in labels:
+            neighbors = graph.edges[label]
+            targets.extend(index[neighbor] for neighbor in neighbors)
+            weights.extend(graph.weights[(label, neighbor)] for neighbor in neighbors)
+            offsets.append(len(targets))
+
+        return cls(labels, offsets, targets, weights, index=index)
+
+    def to_labels(self, distances, previous):
+        """Convert index-based results into dijkstra-style label dictionaries"""
+        labels = self.labels
+        return (dict(zip(labels, distances)),
+                {labels[i]: (labels[p] if p >= 0 else None) for i, p in enumerate(previous)})
+
+def load_edge_list(path, delimiter=None, weight_type=float, chunk_size=1 << 20, header=False):
+    """
+    Stream an undirected edge list ("from to [weight]" per line, '#' comments,
+    any delimiter, e.g. ',' for CSV) straight into a CSRGraph, reading about
+    chunk_size bytes at a time. Missing weights default to 1, labels stay strings.
+    Blank lines and lines with fewer than two fields are skipped, and
+    header=True skips the first remaining line (a CSV header row).
+    """
+    index = {}
+    labels = []
+    sources = array("q")
+    targets = array("q")
+    weights = array("q" if weight_type is int else "d")
+
+    with open(path) as f:
+        while True:
+            lines = f.readlines(chunk_size)
+            if not lines:
+                break
+            for line in lines:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                fields = line.split(delimiter)
+                if len(fields) < 2:
+                    continue
+                if header:
+                    header = False
+                    continue
+                endpoints = []
+                for label in (fields[0].strip(), fields[1].strip()):
+                    number = index.get(label)
+                    if number is None:
+                        number = index[label] = len(labels)
+                        labels.append(label)
+                    endpoints.append(number)
+                sources.append(endpoints[0])
+                targets.append(endpoints[1])
+                weights.append(weight_type(fields[2]) if len(fields) > 2 else 1)
+
+    # Counting sort of both edge directions into CSR order
+    n = len(labels)
+    degrees = array("q", bytes(8 * (n + 1)))
+    for u, v in zip(sources, targets):
+        degrees[u + 1] += 1
+        degrees[v + 1] += 1
+    offsets = degrees
+    for i in range(n):
+        offsets[i + 1] += offsets[i]
+
+    position = array("q", offsets[:-1]) if n else array("q")
+    csr_targets = array("q", bytes(8 * 2 * len(sources)))
+    csr_weights = array(weights.typecode, bytes(8 * 2 * len(sources)))
+    for u, v, weight in zip(sources, targets, weights):
+        csr_targets[position[u]] = v
+        csr_weights[position[u]] = weight
+        position[u] += 1
+        csr_targets[position[v]] = u
+        csr_weights[position[v]] = weight
+        position[v] += 1
+
+    return CSRGraph(labels, offsets, csr_targets, csr_weights, index=index)
+
+class MappedLabels:
+    """
+    Read-only sequence of labels stored as one UTF-8 blob plus an offsets
+    array: label i is blob[offsets[i]:offsets[i + 1]], decoded when asked for.
+    """
+
+    __slots__ = ("offsets", "blob")
+
+    def __init__(self, offsets, blob):
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        n = len(self.offsets) - 1
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("label index out of range")
+        return str(self.blob[self.offsets[i]:self.offsets[i + 1]], "utf-8")
+
+    def __iter__(self):
+        offsets, blob = self.offsets, self.blob
+        for i in range(len(offsets) - 1):
+            yield str(blob[offsets[i]:offsets[i + 1]], "utf-8")
+
+# Binary CSR file: header, then offsets, targets, weights and label offsets
+# as 8-byte arrays, then the labels as one UTF-8 blob.
+CSR_MAGIC = b"CSRGRPH2"
+CSR_HEADER = struct.Struct("<8sqqcxxxxxxx")
+
+def save_csr(csr, path):
+    """Write csr in the binary format read by open_csr (labels are saved as str)"""
+    encoded = [str(label).encode() for label in csr.labels]
+    label_offsets = array("q", [0])
+    for label in encoded:
+        label_offsets.append(label_offsets[-1] + len(label))
+    with open(path, "wb") as f:
+        f.write(CSR_HEADER.pack(CSR_MAGIC, len(csr), len(csr.targets),
+                                csr.weights.typecode.encode()))
+        for values, typecode in ((csr.offsets, "q"), (csr.targets, "q"),
+                                 (csr.weights, csr.weights.typecode)):
+            array(typecode, values).tofile(f)
+        label_offsets.tofile(f)
+        f.write(b"".join(encoded))
+
+def open_csr(path):
+    """
+    Memory-map a file written by save_csr. The arrays and the labels are
+    read-only views of the file, so opening costs the same for any graph
+    size and processes mapping the same file share its pages. Labels are
+    decoded, and the label index built, only when used.
+    """
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, n, m, typecode = CSR_HEADER.unpack_from(mapped)
+    if magic != CSR_MAGIC:
+        raise ValueError(f"{path} is not a CSR graph file")
+
+    view = memoryview(mapped)
+    start = CSR_HEADER.size
+    offsets = view[start:start + 8 * (n + 1)].cast("q")
+    start += 8 * (n + 1)
+    targets = view[start:start + 8 * m].cast("q")
+    start += 8 * m
+    weights = view[start:start + 8 * m].cast(typecode.decode())
+    start += 8 * m
+    label_offsets = view[start:start + 8 * (n + 1)].cast("q")
+    start += 8 * (n + 1)
+    labels = MappedLabels(label_offsets, view[start:])
+
+    return CSRGraph(labels, offsets, targets, weights, path=path)
+
+def csr_shortest_path_tree(csr, source):
+    """Dijkstra over vertex numbers; returns (distances, previous) lists, -1 means no parent"""
+    n = len(csr)
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+    distances = [float('infinity')] * n
+    previous = [-1] * n
+    visited = bytearray(n)
+    distances[source] = 0
+
+    pq = [(0, source)]
+    while pq:
+        current_distance, current_vertex = heapq.heappop(pq)
+        if visited[current_vertex]:
+            continue
+        visited[current_vertex] = 1
+
+        start, end = offsets[current_vertex], offsets[current_vertex + 1]
+        for neighbor, weight in zip(targets[start:end], weights[start:end]):
+            distance = current_distance + weight
+            if distance < distances[neighbor]:
+                distances[neighbor] = distance
+                previous[neighbor] = current_vertex
+                heapq.heappush(pq, (distance, neighbor))
+
+    return distances, previous
+
+def dijkstra_csr(csr, initial):
+    """Same result as dijkstra(graph, initial), computed on a CSRGraph"""
+    distances, previous = csr_shortest_path_tree(csr, csr.index[initial])
+    return csr.to_labels(distances, previous)
+
+class ContractionHierarchy:
+    """
+    Contraction hierarchy over a static Graph. Vertices are contracted one by
+    one in order of importance, adding shortcut edges that keep shortest path
+    distances intact. Queries then only search upwards in the order from both
+    ends, which touches a tiny part of the graph.
+    """
+
+    def __init__(self, labels, rank, upward, middle):
+        self.labels = labels
+        self.index = {label: i for i, label in enumerate(labels)}
+        self.rank = rank        # rank[v] is the contraction position of v
+        self.upward = upward    # upward[v] is a list of (higher vertex, weight)
+        self.middle = middle    # middle[(u, w)] is the vertex a shortcut skips
+
+    @classmethod
+    def build(cls, graph, witness_settle_limit=64):
+        labels = list(graph.edges)
+        index = {label: i for i, label in enumerate(labels)}
+        n = len(labels)
+
+        adjacency = [{} for _ in range(n)]
+        for (from_node, to_node), weight in graph.weights.items():
+            u, w = index[from_node], index[to_node]
+            if u != w and weight < adjacency[u].get(w, float('infinity')):
+                adjacency[u][w] = weight
+                adjacency[w][u] = weight
+
+        deleted_neighbors = [0] * n
+        rank = [0] * n
+        upward = [[] for _ in range(n)]
+        middle = {}
+
+        def shortcuts_for(v):
+            """Shortcuts (u, w, weight) needed to contract v"""
+            neighbors = list(adjacency[v].items())
+            if len(neighbors) < 2:
+                return neighbors, []
+            shortcuts = []
+            for i, (u, weight_u) in enumerate(neighbors[:-1]):
+                targets = dict(neighbors[i + 1:])
+                witness = _witness_search(adjacency, u, v, targets,
+                                          weight_u + max(targets.values()), witness_settle_limit)
+                for w, weight_w in targets.items():
+                    via = weight_u + weight_w
+                    if witness.get(w, float('infinity')) > via:
+                        shortcuts.append((u, w, via))
+            return neighbors, shortcuts
+
+        def priority(neighbors, shortcuts, v):
+            # Edge difference plus a term that spreads contraction evenly
+            return len(shortcuts) - len(neighbors) + deleted_neighbors[v]
+
+        queue = [(priority(*shortcuts_for(v), v), v) for v in range(n)]
+        heapq.heapify(queue)
+        order = 0
+        while queue:
+            _, v = heapq.heappop(queue)
+            # Lazy update: re-evaluate and postpone v if it got more expensive
+            neighbors, shortcuts = shortcuts_for(v)
+            current = priority(neighbors, shortcuts, v)
+            if queue and current > queue[0][0]:
+                heapq.heappush(queue, (current, v))
+                continue
+
+            for u, w, weight in shortcuts:
+                adjacency[u][w] = adjacency[w][u] = weight
+                middle[(u, w)] = middle[(w, u)] = v
+
+            # Every remaining neighbour is contracted later, so these edges point up
+            upward[v] = neighbors
+            rank[v] = order
+            order += 1
+            for u, _ in neighbors:
+                del adjacency[u][v]
+                deleted_neighbors[u] += 1
+            adjacency[v] = {}
+
+        return cls(labels, rank, upward, middle)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            pickle.dump((self.labels, self.rank, self.upward, self.middle), f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls(*pickle.load(f))
+
+    def _search(self, source, target):
+        """Bidirectional upward search; returns (distance, meeting vertex, previous maps)"""
+        distances = ({source: 0}, {target: 0})
+        previous = ({source: None}, {target: None})
+        queues = ([(0, source)], [(0, target)])
+        best = float('infinity')
+        meeting = None
+
+        while True:
+            active = [side for side in (0, 1) if queues[side] and queues[side][0][0] < best]
+            if not active:
+                break
+            for side in active:
+                current_distance, v = heapq.heappop(queues[side])
+                if current_distance > distances[side][v]:
+                    continue
+                other = distances[1 - side].get(v)
+                if other is not None and current_distance + other < best:
+                    best = current_distance + other
+                    meeting = v
+                for w, weight in self.upward[v]:
+                    distance = current_distance + weight
+                    if distance < distances[side].get(w, float('infinity')):
+                        distances[side][w] = distance
+                        previous[side][w] = v
+                        heapq.heappush(queues[side], (distance, w))
+
+        return best, meeting, previous
+
+    def distance(self, source, target):
+        best, _, _ = self._search(self.index[source], self.index[target])
+        return best
+
+    def path(self, source, target):
+        """Return (distance, path) with all shortcuts expanded to original edges"""
+        best, meeting, previous = self._search(self.index[source], self.index[target])
+        if meeting is None:
+            return float('infinity'), []
+
+        hierarchy_path = get_path(previous[0], meeting) + get_path(previous[1], meeting)[::-1][1:]
+        path = [hierarchy_path[0]]
+        for u, w in zip(hierarchy_path, hierarchy_path[1:]):
+            stack = [(u, w)]
+            while stack:
+                a, b = stack.pop()
+                m = self.middle.get((a, b))
+                if m is None:
+                    path.append(b)
+                else:
+                    stack.append((m, b))
+                    stack.append((a, m))
+
+        return best, [self.labels[v] for v in path]
+
+def _witness_search(adjacency, source, skip, targets, limit, settle_limit):
+    """
+    Bounded Dijkstra from source over the remaining graph, avoiding skip.
+    Stops once every target is settled, the distance exceeds limit, or
+    settle_limit vertices are settled.
+    """
+    distances = {source: 0}
+    pq = [(0, source)]
+    remaining = len(targets)
+    settled = 0
+    while pq and remaining and settled < settle_limit:
+        current_distance, u = heapq.heappop(pq)
+        if current_distance > limit:
+            break
+        if current_distance > distances[u]:
+            continue
+        settled += 1
+        if u in targets:
+            remaining -= 1
+        for w, weight in adjacency[u].items():
+            if w == skip:
+                continue
+            distance = current_distance + weight
+            if distance < distances.get(w, float('infinity')):
+                distances[w] = distance
+                heapq.heappush(pq, (distance, w))
+    return distances
+
+# Batch queries: the CSRGraph is handed to each worker process once, either
+# inherited through fork (no pickling at all) or through the pool initializer
+# (pickled once per worker), never once per task.
+_worker_csr = None
+_worker_targets = None
+
+def _init_worker(csr, targets):
+    global _worker_csr, _worker_targets
+    _worker_csr = csr
+    _worker_targets = targets
+
+def _worker_tree(source):
+    distances, previous = csr_shortest_path_tree(_worker_csr, source)
+    return source, distances, previous
+
+def _worker_row(position_and_source):
+    position, source = position_and_source
+    distances, _ = csr_shortest_path_tree(_worker_csr, source)
+    return position, [distances[target] for target in _worker_targets]
+
+def _run_pool(csr, targets, task, items, workers):
+    """Yield task results from a process pool as they finish"""
+    global _worker_csr, _worker_targets
+    if "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+        _worker_csr, _worker_targets = csr, targets
+        initializer, initargs = None, ()
+    else:
+        context = multiprocessing.get_context()
+        initializer, initargs = _init_worker, (csr, targets)
+
+    try:
+        with context.Pool(workers or os.cpu_count(), initializer, initargs) as pool:
+            yield from pool.imap_unordered(task, items)
+    finally:
+        _worker_csr = _worker_targets = None
+
+def dijkstra_many(graph, sources, workers=None):
+    """
+    Run dijkstra from every source on all cores. Yields (source, distances,
+    previous) in completion order, with the same dictionaries as dijkstra.
+    graph may be a Graph or an already built CSRGraph.
+    """
+    csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_graph(graph)
+    items = [csr.index[source] for source in sources]
+    for source, distances, previous in _run_pool(csr, None, _worker_tree, items, workers):
+        yield (csr.labels[source],) + csr.to_labels(distances, previous)
+
+def distance_matrix(graph, sources, targets, workers=None):
+    """Return matrix[i][j], the distance from sources[i] to targets[j], computed in parallel"""
+    csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_graph(graph)
+    target_indices = [csr.index[target] for target in targets]
+    items = [(position, csr.index[source]) for position, source in enumerate(sources)]
+    matrix = [None] * len(sources)
+    for position, row in _run_pool(csr, target_indices, _worker_row, items, workers):
+        matrix[position] = row
+    return matrix
+
+def random_graph(num_nodes, num_edges, max_weight=10, seed=None):
+    """Connected random graph with integer vertices and weights (for benchmarks)"""
+    rng = random.Random(seed)
+    g = Graph()
+    for node in range(1, num_nodes):
+        g.add_edge(rng.randrange(node), node, rng.randint(1, max_weight))
+    for _ in range(num_edges - (num_nodes - 1)):
+        g.add_edge(rng.randrange(num_nodes), rng.randrange(num_nodes), rng.randint(1, max_weight))
+    return g
+
+def grid_graph(width, height, max_weight=10, seed=None):
+    """
+    Grid graph with integer weights of at least 1 between neighbouring cells.
+    Returns (graph, coordinates), the coordinates suit euclidean_heuristic.
+    """
+    rng = random.Random(seed)
+    g = Graph()
+    coordinates = {}
+    for x in range(width):
+        for y in range(height):
+            coordinates[(x, y)] = (x, y)
+            if x + 1 < width:
+                g.add_edge((x, y), (x + 1, y), rng.randint(1, max_weight))
+            if y + 1 < height:
+                g.add_edge((x, y), (x, y + 1), rng.randint(1, max_weight))
+    return g, coordinates
+
+def benchmark_point_to_point(width=300, height=300, queries=20):
+    """Compare settled vertices and time of the point-to-point searches"""
+    g, coordinates = grid_graph(width, height, seed=1)
+    heuristic = euclidean_heuristic(coordinates)
+    rng = random.Random(2)
+    pairs = [(rng.choice(list(coordinates)), rng.choice(list(coordinates))) for _ in range(queries)]
+
+    print(f"Grid {width}x{height}, {queries} random queries")
+    searches = (("full dijkstra", lambda s, t: dijkstra(g, s)[0][t]),
+                ("shortest_path", lambda s, t: shortest_path(g, s, t)),
+                ("bidirectional", lambda s, t: bidirectional_dijkstra(g, s, t)),
+                ("astar", lambda s, t: astar(g, s, t, heuristic)))
+    for name, search in searches:
+        settled = 0
+        start = time.perf_counter()
+        for source, target in pairs:
+            result = search(source, target)
+            settled += result[2] if isinstance(result, tuple) else len(coordinates)
+        elapsed = (time.perf_counter() - start) / queries
+        print(f"{name:<16} {elapsed * 1000:9.2f} ms/query {settled // queries:9} settled/query")
+
+def test_contraction_hierarchy(trials=20, num_nodes=100, num_edges=250, queries=50, seed=0):
+    """Check ContractionHierarchy answers against dijkstra + get_path on random graphs"""
+    import tempfile
+
+    rng = random.Random(seed)
+    for trial in range(trials):
+        g = random_graph(num_nodes, num_edges, seed=rng.randrange(2 ** 32))
+        g.add_edge('X', 'Y', 1)  # A separate component: unreachable queries
+        ch = ContractionHierarchy.build(g)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "graph.ch")
+            ch.save(path)
+            ch = ContractionHierarchy.load(path)
+
+        vertices = list(g.edges)
+        for _ in range(queries):
+            source, target = rng.choice(vertices), rng.choice(vertices)
+            distances, previous = dijkstra(g, source)
+            expected_path = get_path(previous, target) if distances[target] < float('infinity') else []
+            distance, path = ch.path(source, target)
+
+            assert distance == distances[target] == ch.distance(source, target), (trial, source, target)
+            if expected_path:
+                # Ties may give a different but equally short path, made of original edges
+                edges = list(zip(path, path[1:]))
+                assert all(edge in g.weights for edge in edges), (trial, path)
+                cost = sum(g.weights[edge] for edge in edges)
+                assert path[0] == source and path[-1] == target and cost == distance, (trial, path)
+            else:
+                assert path == []
+
+    print(f"Contraction hierarchy matched dijkstra on {trials * queries} queries")
+
+def test_queues(seed=0):
+    """Check every priority queue against heapq, including weights wider than 64 bits"""
+    rng = random.Random(seed)
+    for max_weight in (10, 10 ** 6, 2 ** 63, 10 ** 20):
+        g = random_graph(200, 600, max_weight=max_weight, seed=rng.randrange(2 ** 32))
+        expected, _, _ = dijkstra_with_queue(g, 0, "heapq")
+        assert dijkstra(g, 0)[0] == expected, max_weight
+        # Dial's buckets need max_weight slots, so only try them on small weights
+        names = ("radix", "indexed", "bucket") if max_weight <= 10 ** 6 else ("radix", "indexed")
+        for name in names:
+            assert dijkstra_with_queue(g, 0, name)[0] == expected, (name, max_weight)
+
+    g = Graph()
+    g.add_edge('a', 'b', 10 ** 20)
+    g.add_edge('b', 'c', 2 ** 64)
+    assert dijkstra(g, 'a')[0] == {'a': 0, 'b': 10 ** 20, 'c': 10 ** 20 + 2 ** 64}
+    print("All priority queues matched heapq")
+
+def benchmark_contraction_hierarchy(width=100, height=100, queries=200):
+    """Compare preprocessing and query time of the hierarchy with plain searches on a grid"""
+    g, coordinates = grid_graph(width, height, seed=1)
+    start = time.perf_counter()
+    ch = ContractionHierarchy.build(g)
+    print(f"Build: {time.perf_counter() - start:.2f} s for a {width}x{height} grid")
+
+    rng = random.Random(2)
+    vertices = list(coordinates)
+    pairs = [(rng.choice(vertices), rng.choice(vertices)) for _ in range(queries)]
+    for name, search in (("shortest_path", lambda s, t: shortest_path(g, s, t)),
+                         ("ch.distance", ch.distance),
+                         ("ch.path", ch.path)):
+        start = time.perf_counter()
+        for source, target in pairs:
+            search(source, target)
+        print(f"{name:<14} {(time.perf_counter() - start) / queries * 1000:8.3f} ms/query")
+
+def benchmark_parallel(num_nodes=50000, num_edges=200000, num_sources=32, max_workers=None):
+    """Time distance_matrix over 1..max_workers processes"""
+    csr = CSRGraph.from_graph(random_graph(num_nodes, num_edges, seed=1))
+    rng = random.Random(2)
+    sources = rng.sample(range(num_nodes), num_sources)
+    targets = rng.sample(range(num_nodes), 100)
+
+    baseline = None
+    for workers in range(1, (max_workers or os.cpu_count()) + 1):
+        start = time.perf_counter()
+        distance_matrix(csr, sources, targets, workers)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers:>2} workers: {elapsed:7.2f} s  speedup {baseline / elapsed:5.2f}x")
+
+def benchmark_dynamic_updates(num_nodes=50000, num_edges=150000, updates=200, full_runs=5):
+    """Stream random edge updates and compare DynamicSSSP repairs with full recomputation"""
+    g = random_graph(num_nodes, num_edges, seed=1)
+    rng = random.Random(2)
+    sssp = DynamicSSSP(g, 0)
+
+    # Weight increases of tree edges are the expensive repairs, so time them apart
+    times = {"decrease": 0.0, "increase": 0.0}
+    counts = {"decrease": 0, "increase": 0}
+    updated = 0
+    for _ in range(updates):
+        if rng.random() < 0.5:
+            # New edge or weight change of an existing one
+            from_node, to_node = rng.randrange(num_nodes), rng.randrange(num_nodes)
+        else:
+            from_node = rng.randrange(num_nodes)
+            to_node = rng.choice(g.edges[from_node])
+        weight = rng.randint(1, 10)
+        old_weight = g.weights.get((from_node, to_node))
+        kind = "increase" if old_weight is not None and weight > old_weight else "decrease"
+        start = time.perf_counter()
+        updated += sssp.add_edge(from_node, to_node, weight)
+        times[kind] += time.perf_counter() - start
+        counts[kind] += 1
+    repair_time = sum(times.values()) / updates
+
+    start = time.perf_counter()
+    for _ in range(full_runs):
+        distances, _ = dijkstra(g, 0)
+    full_time = (time.perf_counter() - start) / full_runs
+
+    assert distances == sssp.distances
+    print(f"{updates} updates, {updated / updates:.1f} vertices touched per update")
+    for kind in ("decrease", "increase"):
+        if counts[kind]:
+            print(f"{kind:<10}  {times[kind] / counts[kind] * 1000:8.2f} ms/update ({counts[kind]} updates)")
+    print(f"repair:     {repair_time * 1000:8.2f} ms/update")
+    print(f"recompute:  {full_time * 1000:8.2f} ms/update ({full_time / repair_time:.0f}x slower)")
+
+def benchmark_queues(num_nodes=100000, num_edges=400000, max_weight=10):
+    """Compare time and operation counts of the priority queues on integer weights"""
+    g = random_graph(num_nodes, num_edges, max_weight=max_weight, seed=1)
+    print(f"Auto choice: {type(choose_queue(g)).__name__}")
+    expected = None
+    for name in ("heapq", "bucket", "radix", "indexed"):
+        start = time.perf_counter()
+        distances, _, operations = dijkstra_with_queue(g, 0, name)
+        elapsed = time.perf_counter() - start
+        expected = expected or distances
+        assert distances == expected
+        print(f"{name:<8} {elapsed:7.3f} s  {operations}")
+
+def benchmark_csr(num_nodes=100000, num_edges=500000, queries=3):
+    """Compare memory and query time of the dict Graph and CSRGraph"""
+    tracemalloc.start()
+    g = random_graph(num_nodes, num_edges, seed=1)
+    graph_memory = tracemalloc.get_traced_memory()[0]
+    csr = CSRGraph.from_graph(g)
+    csr_memory = tracemalloc.get_traced_memory()[0] - graph_memory
+    tracemalloc.stop()
+
+    print(f"Graph: {num_nodes} vertices, {num_edges} edges")
+    print(f"dict Graph memory: {graph_memory / 2 ** 20:8.1f} MiB")
+    print(f"CSRGraph memory:   {csr_memory / 2 ** 20:8.1f} MiB")
+
+    sources = random.Random(2).sample(range(num_nodes), queries)
+    for name, run in (("dijkstra", lambda s: dijkstra(g, s)),
+                      ("dijkstra_csr", lambda s: dijkstra_csr(csr, s)),
+                      ("csr_shortest_path_tree", lambda s: csr_shortest_path_tree(csr, csr.index[s]))):
+        start = time.perf_counter()
+        for source in sources:
+            run(source)
+        print(f"{name:<24} {(time.perf_counter() - start) / queries:8.3f} s/query")
+
 # Example usage
 def test_dijkstra():
     # Create a sample graph
@@ -91,5 +1235,15 @@ def test_dijkstra():
         print(f"Path: {' -> '.join(path)}")
         print()
 
+    # Repeated queries from the same source are served from the cache
+    cache = ShortestPathCache(g, max_entries=2)
+    for target in ('D', 'E', 'D'):
+        cache.path('A', target)
+    print(f"Cache statistics: {cache.stats}")
+
+    # Point-to-point query that stops once the target is settled
+    distance, path, settled = bidirectional_dijkstra(g, 'A', 'E')
+    print(f"A -> E: {distance} via {' -> '.join(path)} ({settled} vertices settled)")
+
 if __name__ == "__main__":
     test_dijkstra()
\ No newline at end of file
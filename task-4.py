@@ -1,4 +1,6 @@
 import uuid
+from array import array
+import numpy as np
 import networkx as nx
 import matplotlib.pyplot as plt
 
@@ -13,6 +15,13 @@ class HeapNode:
 class BinaryHeap:
     def __init__(self):
         self.heap = []
+        # key -> set of indices holding that key, so repeated keys keep all
+        # their entries. Built on the first decrease_key/remove, which keeps
+        # insert/extract free of the upkeep and of needing hashable keys.
+        self.position = None
+
+    def __len__(self):
+        return len(self.heap)
 
     def parent(self, i):
         return (i - 1) // 2
@@ -24,17 +33,141 @@ class BinaryHeap:
         return 2 * i + 2
 
     def swap(self, i, j):
-        self.heap[i], self.heap[j] = self.heap[j], self.heap[i]
+        heap = self.heap
+        heap[i], heap[j] = heap[j], heap[i]
+        if self.position is not None and heap[i] != heap[j]:
+            self._track(heap[i], j, i)
+            self._track(heap[j], i, j)
 
     def insert(self, key):
         self.heap.append(key)
+        if self.position is not None:
+            self._track(key, None, len(self.heap) - 1)
         self._heapify_up(len(self.heap) - 1)
 
+    def heapify(self, values):
+        """Replace the contents with values in O(n) by sifting down from the last parent"""
+        self.heap = list(values)
+        self.position = None
+        for i in range(len(self.heap) // 2 - 1, -1, -1):
+            self._heapify_down(i)
+
+    def peek(self):
+        if not self.heap:
+            raise IndexError("peek from an empty heap")
+        return self.heap[0]
+
+    def extract_min(self):
+        if not self.heap:
+            raise IndexError("extract_min from an empty heap")
+        return self._remove_at(0)
+
+    def pushpop(self, key):
+        """Insert key and extract the minimum in one sift"""
+        heap = self.heap
+        if heap and heap[0] < key:
+            key, heap[0] = heap[0], key
+            if self.position is not None:
+                self._track(key, 0, None)
+                self._track(heap[0], None, 0)
+            self._heapify_down(0)
+        return key
+
+    def decrease_key(self, key, new_key):
+        i = self._index(key)
+        if key < new_key:
+            raise ValueError(f"new key {new_key} is greater than current key {key}")
+        self._track(key, i, None)
+        self._track(new_key, None, i)
+        self.heap[i] = new_key
+        self._heapify_up(i)
+
+    def remove(self, key):
+        """Remove one occurrence of key"""
+        return self._remove_at(self._index(key))
+
+    def _index(self, key):
+        """Index of one occurrence of key, building the position map if needed"""
+        if self.position is None:
+            position = {}
+            for i, value in enumerate(self.heap):
+                position.setdefault(value, set()).add(i)
+            self.position = position
+        return next(iter(self.position[key]))
+
+    def _track(self, key, old, new):
+        """Move one entry of key in the position map from index old to new (None for absent)"""
+        position = self.position
+        if old is not None:
+            indices = position[key]
+            indices.discard(old)
+            if not indices:
+                del position[key]
+        if new is not None:
+            position.setdefault(key, set()).add(new)
+
+    def _remove_at(self, i):
+        heap = self.heap
+        key = heap[i]
+        last = heap.pop()
+        tracking = self.position is not None
+        if tracking:
+            self._track(key, i, None)
+        if i < len(heap):
+            heap[i] = last
+            if tracking:
+                self._track(last, len(heap), i)
+            self._heapify_up(self._heapify_down(i))
+        return key
+
     def _heapify_up(self, i):
-        parent = self.parent(i)
-        if i > 0 and self.heap[i] < self.heap[parent]:
-            self.swap(i, parent)
-            self._heapify_up(parent)
+        """Sift heap[i] up, returns its final index"""
+        heap, position = self.heap, self.position
+        start = i
+        key = heap[i]
+        while i > 0:
+            parent = (i - 1) // 2
+            if not key < heap[parent]:
+                break
+            moved = heap[i] = heap[parent]
+            if position is not None:
+                indices = position[moved]
+                indices.discard(parent)
+                indices.add(i)
+            i = parent
+        heap[i] = key
+        if position is not None and i != start:
+            indices = position[key]
+            indices.discard(start)
+            indices.add(i)
+        return i
+
+    def _heapify_down(self, i):
+        """Sift heap[i] down, returns its final index"""
+        heap, position = self.heap, self.position
+        size = len(heap)
+        start = i
+        key = heap[i]
+        while True:
+            child = 2 * i + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap[child + 1] < heap[child]:
+                child += 1
+            if not heap[child] < key:
+                break
+            moved = heap[i] = heap[child]
+            if position is not None:
+                indices = position[moved]
+                indices.discard(child)
+                indices.add(i)
+            i = child
+        heap[i] = key
+        if position is not None and i != start:
+            indices = position[key]
+            indices.discard(start)
+            indices.add(i)
+        return i
 
     def to_tree_node(self, index=0):
         if index >= len(self.heap):
@@ -51,6 +184,74 @@ class BinaryHeap:
 
         return node
 
+class DaryHeap:
+    """
+    Min-heap with a configurable number of children per node (children of i
+    are d*i+1 .. d*i+d). A typecode such as "d" or "q" stores numeric keys in
+    a typed array instead of a list of Python objects.
+    """
+
+    def __init__(self, arity=8, typecode=None):
+        if arity < 2:
+            raise ValueError("arity must be at least 2")
+        self.arity = arity
+        self.heap = array(typecode) if typecode else []
+
+    def __len__(self):
+        return len(self.heap)
+
+    def insert(self, key):
+        heap = self.heap
+        heap.append(key)
+        i = len(heap) - 1
+        while i > 0:
+            parent = (i - 1) // self.arity
+            if not key < heap[parent]:
+                break
+            heap[i] = heap[parent]
+            i = parent
+        heap[i] = key
+
+    def heapify(self, values):
+        self.heap = array(self.heap.typecode, values) if isinstance(self.heap, array) else list(values)
+        for i in range((len(self.heap) - 2) // self.arity, -1, -1):
+            self._sift_down(i)
+
+    def peek(self):
+        if not self.heap:
+            raise IndexError("peek from an empty heap")
+        return self.heap[0]
+
+    def extract_min(self):
+        heap = self.heap
+        if not heap:
+            raise IndexError("extract_min from an empty heap")
+        top = heap[0]
+        last = heap.pop()
+        if heap:
+            heap[0] = last
+            self._sift_down(0)
+        return top
+
+    def _sift_down(self, i):
+        heap, arity = self.heap, self.arity
+        size = len(heap)
+        key = heap[i]
+        while True:
+            first = arity * i + 1
+            if first >= size:
+                break
+            # Smallest of up to arity children, which sit next to each other in memory
+            child = first
+            for candidate in range(first + 1, min(first + arity, size)):
+                if heap[candidate] < heap[child]:
+                    child = candidate
+            if not heap[child] < key:
+                break
+            heap[i] = heap[child]
+            i = child
+        heap[i] = key
+
 def add_edges(graph, node, pos, x=0, y=0, layer=1):
     if node is not None:
         graph.add_node(node.id, color=node.color, label=node.val)
@@ -78,16 +279,173 @@ def draw_heap(heap_root):
     nx.draw(tree, pos=pos, labels=labels, arrows=False, node_size=2500, node_color=colors)
     plt.show()
 
-def visualize_heap(values):
+def heap_layout(n):
+    """
+    Positions of the first n heap slots, computed from the indices alone:
+    slot i is on level k = floor(log2(i + 1)) at offset j = i - (2**k - 1), so
+    it sits at x = (2j + 1) / 2**k - 1, y = -k (the layout used by add_edges).
+    """
+    index = np.arange(n)
+    level = np.frexp(index + 1)[1] - 1
+    offset = index - (2 ** level - 1)
+    x = (2 * offset + 1) / 2.0 ** level - 1
+    return np.column_stack((x, -level))
+
+def draw_heap_array(values, max_depth=None, color="skyblue", label_limit=63, ax=None):
+    """
+    Draw an array heap with one line plot for the edges and one scatter for
+    the nodes, with no tree nodes or networkx graph. Levels deeper than
+    max_depth are left out. Handles 10**5+ nodes.
+    """
+    n = len(values)
+    if max_depth is not None:
+        n = min(n, 2 ** (max_depth + 1) - 1)
+    positions = heap_layout(n)
+
+    if ax is None:
+        _, ax = plt.subplots(figsize=(12, 6))
+    # All edges as one NaN-separated polyline: a single Path instead of one per edge
+    children = np.arange(1, n)
+    edges = np.full((len(children), 3, 2), np.nan)
+    edges[:, 0] = positions[(children - 1) // 2]
+    edges[:, 1] = positions[children]
+    ax.plot(edges[:, :, 0].ravel(), edges[:, :, 1].ravel(), color="gray", linewidth=0.5, zorder=1)
+
+    # Node size shrinks with the width of the deepest level
+    depth = int(positions[-1, 1] * -1) if n else 0
+    node_size = max(1.0, 2500 / 2 ** depth)
+    ax.scatter(positions[:, 0], positions[:, 1], s=node_size, c=color, zorder=2)
+    if n <= label_limit:
+        for (x, y), value in zip(positions, values):
+            ax.annotate(str(value), (x, y), ha="center", va="center", zorder=3)
+
+    ax.set_xlim(-1.05, 1.05)
+    ax.set_ylim(-depth - 0.5, 0.5)
+    ax.set_axis_off()
+    return ax
+
+def visualize_heap(values, fast=None):
     # Create and populate the heap
     heap = BinaryHeap()
-    for value in values:
-        heap.insert(value)
+    heap.heapify(values)
+
+    # Large heaps are drawn straight from the array
+    if fast is None:
+        fast = len(heap) > 63
+    if fast:
+        draw_heap_array(heap.heap)
+        plt.show()
+        return
 
     # Convert heap to tree structure and visualize
     root = heap.to_tree_node()
     draw_heap(root)
 
+def benchmark_heap(n=10 ** 6):
+    """Compare BinaryHeap with heapq on n random values"""
+    import heapq
+    import random
+    import time
+
+    values = [random.random() for _ in range(n)]
+    results = {}
+    for name in ("BinaryHeap", "heapq"):
+        timings = []
+        start = time.perf_counter()
+        if name == "BinaryHeap":
+            heap = BinaryHeap()
+            heap.heapify(values)
+        else:
+            heap = list(values)
+            heapq.heapify(heap)
+        timings.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        if name == "BinaryHeap":
+            for _ in range(n):
+                heap.extract_min()
+            for value in values:
+                heap.insert(value)
+        else:
+            for _ in range(n):
+                heapq.heappop(heap)
+            for value in values:
+                heapq.heappush(heap, value)
+        timings.append(time.perf_counter() - start)
+        results[name] = timings
+
+    print(f"{n} elements     heapify (s)   extract all + insert all (s)")
+    for name, (heapify_time, churn_time) in results.items():
+        print(f"{name:<12} {heapify_time:12.3f}   {churn_time:12.3f}")
+
+def benchmark_arity(sizes=(10 ** 4, 10 ** 5, 10 ** 6), arities=(2, 3, 4, 8, 16), typecode=None):
+    """Time insert-only, extract-only and mixed workloads of DaryHeap per arity and size"""
+    import random
+    import time
+
+    print(f"{'size':>8} {'arity':>5} {'insert (s)':>11} {'extract (s)':>12} {'mixed (s)':>10}")
+    for n in sizes:
+        values = [random.random() if typecode != "q" else random.randrange(n) for _ in range(n)]
+        for arity in arities:
+            heap = DaryHeap(arity, typecode)
+            start = time.perf_counter()
+            for value in values:
+                heap.insert(value)
+            insert_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for _ in range(n):
+                heap.extract_min()
+            extract_time = time.perf_counter() - start
+
+            # Mixed: two inserts per extract, as in Dijkstra-like workloads
+            start = time.perf_counter()
+            for i, value in enumerate(values):
+                heap.insert(value)
+                if i % 2:
+                    heap.extract_min()
+            mixed_time = time.perf_counter() - start
+
+            print(f"{n:>8} {arity:>5} {insert_time:11.3f} {extract_time:12.3f} {mixed_time:10.3f}")
+
+def test_priority_queue(n=2000, seed=0):
+    """Check BinaryHeap decrease_key/remove against a sorted list, with unique and repeated keys"""
+    import random
+
+    rng = random.Random(seed)
+    for key_range in (10 ** 9, 20):
+        # Unique keys first, then many duplicates from a small range
+        values = rng.sample(range(key_range), n) if key_range > n else [rng.randrange(key_range) for _ in range(n)]
+        heap = BinaryHeap()
+        heap.heapify(values)
+        expected = sorted(values)
+        for _ in range(n):
+            op = rng.random()
+            key = rng.choice(expected) if expected else None
+            if key is not None and op < 0.3:
+                assert heap.remove(key) == key
+                expected.remove(key)
+            elif key is not None and op < 0.6:
+                new_key = key - rng.randrange(5)
+                heap.decrease_key(key, new_key)
+                expected.remove(key)
+                expected.append(new_key)
+                expected.sort()
+            elif op < 0.8:
+                value = rng.randrange(key_range)
+                heap.insert(value)
+                expected.append(value)
+                expected.sort()
+            elif expected:
+                assert heap.extract_min() == expected.pop(0)
+            assert sorted(heap.heap) == expected
+            assert all(not heap.heap[i] < heap.heap[(i - 1) // 2] for i in range(1, len(heap.heap)))
+            if heap.position is not None:
+                assert sum(len(indices) for indices in heap.position.values()) == len(heap.heap)
+                for key, indices in heap.position.items():
+                    assert all(heap.heap[i] == key for i in indices)
+    print("BinaryHeap priority queue operations match a sorted list")
+
 # Example usage
 def test_heap_visualization():
     # Test with some sample values
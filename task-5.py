@@ -1,15 +1,76 @@
-import uuid
+import math
+import numpy as np
 import networkx as nx
 import matplotlib.pyplot as plt
+from matplotlib.animation import FuncAnimation
+from matplotlib.colors import to_rgba_array
 from collections import deque
 
 class Node:
+    __slots__ = ("left", "right", "val", "color")
+
     def __init__(self, key, color="#FFFFFF"):
         self.left = None
         self.right = None
         self.val = key
         self.color = color
-        self.id = str(uuid.uuid4())
+
+# Traversal generators: each yields nodes lazily in one pass over the tree,
+# using an explicit queue or stack, so deep or skewed trees never hit the
+# recursion limit and no visited set is needed (a tree has no cycles).
+def iter_bfs(root):
+    queue = deque([root] if root else [])
+    while queue:
+        node = queue.popleft()
+        yield node
+        if node.left:
+            queue.append(node.left)
+        if node.right:
+            queue.append(node.right)
+
+def iter_levels(root):
+    """Yield the nodes of each level as a list"""
+    level = [root] if root else []
+    while level:
+        yield level
+        level = [child for node in level for child in (node.left, node.right) if child]
+
+def iter_preorder(root):
+    stack = [root] if root else []
+    while stack:
+        node = stack.pop()
+        yield node
+        # Add right first so left is processed first (stack is LIFO)
+        if node.right:
+            stack.append(node.right)
+        if node.left:
+            stack.append(node.left)
+
+def iter_inorder(root):
+    stack = []
+    node = root
+    while stack or node:
+        while node:
+            stack.append(node)
+            node = node.left
+        node = stack.pop()
+        yield node
+        node = node.right
+
+def iter_postorder(root):
+    stack = []
+    node = root
+    last_visited = None
+    while stack or node:
+        while node:
+            stack.append(node)
+            node = node.left
+        top = stack[-1]
+        if top.right and top.right is not last_visited:
+            node = top.right
+        else:
+            yield top
+            last_visited = stack.pop()
 
 def generate_color_gradient(step, total_steps):
     """Generate color from dark to light blue in hex format"""
@@ -19,79 +80,58 @@ def generate_color_gradient(step, total_steps):
     b = int(240 + (242 - 240) * (step / total_steps))
     return f"#{r:02x}{g:02x}{b:02x}"
 
+HEX_BYTES = np.array([f"{i:02x}" for i in range(256)])
+
+def generate_color_gradient_array(steps, total_steps):
+    """Vectorized generate_color_gradient: hex colors for a whole array of steps"""
+    fraction = np.asarray(steps) / total_steps
+    r = (18 + (178 - 18) * fraction).astype(np.intp)
+    g = (150 + (235 - 150) * fraction).astype(np.intp)
+    b = (240 + (242 - 240) * fraction).astype(np.intp)
+    return np.char.add(np.char.add(np.char.add("#", HEX_BYTES[r]), HEX_BYTES[g]), HEX_BYTES[b])
+
+def color_in_order(nodes):
+    """Color nodes from dark to light in the given visit order"""
+    order = list(nodes)
+    for step, node in enumerate(order):
+        node.color = generate_color_gradient(step, max(len(order) - 1, 1))
+
 def bfs_with_colors(root):
     """Perform BFS and assign colors to nodes based on visit order"""
     if not root:
         return
-
-    queue = deque([(root, 0)])
-    visited = {}
-    step = 0
-    total_nodes = count_nodes(root)
-
-    while queue:
-        node, level = queue.popleft()
-        if node.id not in visited:
-            visited[node.id] = True
-            node.color = generate_color_gradient(step, total_nodes - 1)
-            step += 1
-
-            if node.left:
-                queue.append((node.left, level + 1))
-            if node.right:
-                queue.append((node.right, level + 1))
-
+    color_in_order(iter_bfs(root))
     return root
 
 def dfs_with_colors(root):
     """Perform DFS and assign colors to nodes based on visit order"""
     if not root:
         return
-
-    stack = [root]
-    visited = {}
-    step = 0
-    total_nodes = count_nodes(root)
-
-    while stack:
-        node = stack.pop()
-        if node.id not in visited:
-            visited[node.id] = True
-            node.color = generate_color_gradient(step, total_nodes - 1)
-            step += 1
-
-            # Add right first so left is processed first (stack is LIFO)
-            if node.right:
-                stack.append(node.right)
-            if node.left:
-                stack.append(node.left)
-
+    color_in_order(iter_preorder(root))
     return root
 
 def count_nodes(root):
     """Count total number of nodes in the tree"""
-    if not root:
-        return 0
-    return 1 + count_nodes(root.left) + count_nodes(root.right)
+    return sum(1 for _ in iter_bfs(root))
 
 def add_edges(graph, node, pos, x=0, y=0, layer=1):
     if node is not None:
-        graph.add_node(node.id, color=node.color, label=node.val)
+        graph.add_node(id(node), color=node.color, label=node.val)
         if node.left:
-            graph.add_edge(node.id, node.left.id)
+            graph.add_edge(id(node), id(node.left))
             l = x - 1 / 2 ** layer
-            pos[node.left.id] = (l, y - 1)
+            pos[id(node.left)] = (l, y - 1)
             l = add_edges(graph, node.left, pos, x=l, y=y - 1, layer=layer + 1)
         if node.right:
-            graph.add_edge(node.id, node.right.id)
+            graph.add_edge(id(node), id(node.right))
             r = x + 1 / 2 ** layer
-            pos[node.right.id] = (r, y - 1)
+            pos[id(node.right)] = (r, y - 1)
             r = add_edges(graph, node.right, pos, x=r, y=y - 1, layer=layer + 1)
     return graph
 
 def draw_tree(root, title="Binary Tree"):
     tree = nx.DiGraph()
-    pos = {root.id: (0, 0)}
+    pos = {id(root): (0, 0)}
     tree = add_edges(tree, root, pos)
 
     colors = [node[1]['color'] for node in tree.nodes(data=True)]
@@ -102,6 +142,199 @@ def draw_tree(root, title="Binary Tree"):
     nx.draw(tree, pos=pos, labels=labels, arrows=False, node_size=2500, node_color=colors)
     plt.show()
 
+class ImplicitTree:
+    """
+    Array-backed binary tree: the children of slot i are slots 2i+1 and 2i+2,
+    values live in a NumPy array and valid marks which slots hold a node.
+    Slots below a hole cannot be reached, so they are marked invalid too.
+    Best suited to complete or near-complete trees, since a tree of depth d
+    takes 2**(d+1) - 1 slots.
+    """
+
+    def __init__(self, values, valid=None):
+        values = np.asarray(values)
+        depth = int(np.ceil(np.log2(len(values) + 1))) - 1 if len(values) else 0
+        capacity = 2 ** (depth + 1) - 1
+        self.values = np.zeros(capacity, dtype=values.dtype)
+        self.values[:len(values)] = values
+        self.valid = np.zeros(capacity, dtype=bool)
+        self.valid[:len(values)] = True if valid is None else valid
+        self.depth = depth
+        self.valid = self._reachable()
+
+    def __len__(self):
+        return int(self.valid.sum())
+
+    @classmethod
+    def from_node_tree(cls, root):
+        """Copy a Node tree into slots, keeping its holes as invalid slots"""
+        slots = {}
+        queue = deque([(root, 0)] if root else [])
+        while queue:
+            node, i = queue.popleft()
+            slots[i] = node.val
+            if node.left:
+                queue.append((node.left, 2 * i + 1))
+            if node.right:
+                queue.append((node.right, 2 * i + 2))
+
+        size = max(slots) + 1 if slots else 0
+        values = np.zeros(size, dtype=np.asarray(list(slots.values())).dtype)
+        valid = np.zeros(size, dtype=bool)
+        for i, value in slots.items():
+            values[i] = value
+            valid[i] = True
+        return cls(values, valid)
+
+    def _level_slices(self):
+        return [slice(2 ** k - 1, 2 ** (k + 1) - 1) for k in range(self.depth + 1)]
+
+    def _reachable(self):
+        """Valid slots whose ancestors are all valid"""
+        reachable = self.valid.copy()
+        for level in self._level_slices()[1:]:
+            parents = (np.arange(level.start, level.stop) - 1) // 2
+            reachable[level] &= reachable[parents]
+        return reachable
+
+    def bfs_order(self):
+        """BFS visits the slots in index order"""
+        return np.flatnonzero(self.valid)
+
+    def dfs_order(self):
+        """
+        Pre-order (root, left, right) computed level by level: subtree sizes
+        bottom-up, then each node's pre-order rank top-down.
+        """
+        reachable = self.valid
+        levels = self._level_slices()
+
+        sizes = reachable.astype(np.int64)
+        for level in reversed(levels[:-1]):
+            index = np.arange(level.start, level.stop)
+            sizes[level] += (sizes[2 * index + 1] + sizes[2 * index + 2]) * reachable[level]
+
+        rank = np.zeros(len(sizes), dtype=np.int64)
+        for level in levels[:-1]:
+            index = np.arange(level.start, level.stop)
+            rank[2 * index + 1] = rank[level] + 1
+            rank[2 * index + 2] = rank[level] + 1 + sizes[2 * index + 1]
+
+        slots = np.flatnonzero(reachable)
+        order = np.empty(len(slots), dtype=np.int64)
+        order[rank[slots]] = slots
+        return order
+
+    def colors_for(self, order):
+        """Hex color per slot by position in a visit order (white for unvisited)"""
+        colors = np.full(len(self.values), "#FFFFFF", dtype="<U7")
+        colors[order] = generate_color_gradient_array(np.arange(len(order)), max(len(order) - 1, 1))
+        return colors
+
+def draw_implicit_tree(tree, colors, title="Binary Tree", label_limit=63):
+    """Draw an ImplicitTree with one line plot for edges and one scatter for nodes"""
+    slots = tree.bfs_order()
+    level = np.frexp(slots + 1)[1] - 1
+    x = (2 * (slots - (2 ** level - 1)) + 1) / 2.0 ** level - 1
+    y = -level.astype(float)
+    position = {slot: i for i, slot in enumerate(slots)} if len(slots) <= label_limit else None
+
+    plt.figure(figsize=(10, 6))
+    plt.title(title)
+    child = slots[1:]
+    parent = np.searchsorted(slots, (child - 1) // 2)
+    edges = np.full((len(child), 3, 2), np.nan)
+    edges[:, 0, 0], edges[:, 0, 1] = x[parent], y[parent]
+    edges[:, 1, 0], edges[:, 1, 1] = x[1:], y[1:]
+    plt.plot(edges[:, :, 0].ravel(), edges[:, :, 1].ravel(), color="gray", linewidth=0.5, zorder=1)
+    plt.scatter(x, y, s=max(1.0, 2500 / 2 ** tree.depth), c=colors[slots], edgecolors="gray", zorder=2)
+    if position is not None:
+        for slot, i in position.items():
+            plt.annotate(str(tree.values[slot]), (x[i], y[i]), ha="center", va="center", zorder=3)
+    plt.axis("off")
+    plt.show()
+
+def tree_layout(root):
+    """
+    Nodes in BFS order with their positions (the layout of add_edges) and the
+    BFS index of each node's parent (-1 for the root), in one pass.
+    """
+    nodes = []
+    positions = []
+    parents = []
+    queue = deque([(root, 0.0, 0.0, 1, -1)] if root else [])
+    while queue:
+        node, x, y, layer, parent = queue.popleft()
+        index = len(nodes)
+        nodes.append(node)
+        positions.append((x, y))
+        parents.append(parent)
+        if node.left:
+            queue.append((node.left, x - 1 / 2 ** layer, y - 1, layer + 1, index))
+        if node.right:
+            queue.append((node.right, x + 1 / 2 ** layer, y - 1, layer + 1, index))
+    return nodes, np.array(positions).reshape(-1, 2), np.array(parents, dtype=np.intp)
+
+def animate_traversal(root, order="bfs", path=None, max_frames=300, interval=50, label_limit=63):
+    """
+    Animate a traversal with FuncAnimation and blitting: the layout, edges and
+    node artist are built once and each frame only recolors the nodes visited
+    in that step. Large trees visit several nodes per frame so there are at
+    most max_frames frames. With a path (.gif, .mp4, ...) the animation is
+    saved without a display instead of shown.
+    """
+    nodes, positions, parents = tree_layout(root)
+    index = {id(node): i for i, node in enumerate(nodes)}
+    visit = iter_bfs if order == "bfs" else iter_preorder
+    sequence = np.array([index[id(node)] for node in visit(root)], dtype=np.intp)
+    n = len(sequence)
+    target_colors = to_rgba_array(generate_color_gradient_array(np.arange(n), max(n - 1, 1)))
+    face_colors = np.ones((n, 4))
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.set_title(f"{order.upper()} Traversal")
+    ax.axis("off")
+
+    # Static background: all edges as one NaN-separated line
+    child = np.arange(1, n)
+    edges = np.full((len(child), 3, 2), np.nan)
+    edges[:, 0] = positions[parents[child]]
+    edges[:, 1] = positions[child]
+    ax.plot(edges[:, :, 0].ravel(), edges[:, :, 1].ravel(), color="gray", linewidth=0.5, zorder=1)
+
+    depth = int(-positions[:, 1].min()) if n else 0
+    scatter = ax.scatter(positions[:, 0], positions[:, 1], s=max(1.0, 2500 / 2 ** depth),
+                         c=face_colors, edgecolors="gray", zorder=2, animated=True)
+    labels = []
+    if n <= label_limit:
+        labels = [ax.annotate(str(node.val), positions[i], ha="center", va="center",
+                              zorder=3, animated=True) for i, node in enumerate(nodes)]
+    artists = [scatter] + labels
+
+    nodes_per_frame = max(1, math.ceil(n / max_frames))
+    frames = math.ceil(n / nodes_per_frame)
+
+    def init():
+        face_colors[:] = 1
+        scatter.set_facecolor(face_colors)
+        return artists
+
+    def update(frame):
+        batch = slice(frame * nodes_per_frame, (frame + 1) * nodes_per_frame)
+        face_colors[sequence[batch]] = target_colors[batch]
+        scatter.set_facecolor(face_colors)
+        return artists
+
+    animation = FuncAnimation(fig, update, frames=frames, init_func=init,
+                              interval=interval, blit=True, repeat=False)
+    if path:
+        writer = "pillow" if path.lower().endswith(".gif") else "ffmpeg"
+        animation.save(path, writer=writer, fps=max(1, 1000 // interval))
+        plt.close(fig)
+    else:
+        plt.show()
+    return animation
+
 def create_sample_tree():
     root = Node(1)
     root.left = Node(2)
@@ -112,6 +345,65 @@ def create_sample_tree():
     root.right.right = Node(7)
     return root
 
+def build_complete_tree(n, node_class=Node):
+    """Complete binary tree with values 0..n-1 in BFS order"""
+    nodes = [node_class(i) for i in range(n)]
+    for i, node in enumerate(nodes):
+        if 2 * i + 1 < n:
+            node.left = nodes[2 * i + 1]
+        if 2 * i + 2 < n:
+            node.right = nodes[2 * i + 2]
+    return nodes[0] if nodes else None
+
+def benchmark_traversals(n=10 ** 6):
+    """Compare memory and BFS coloring time with the old uuid/visited-dict approach"""
+    import time
+    import tracemalloc
+    import uuid
+
+    class UuidNode:
+        def __init__(self, key, color="#FFFFFF"):
+            self.left = None
+            self.right = None
+            self.val = key
+            self.color = color
+            self.id = str(uuid.uuid4())
+
+    # The original recursive count, an extra full pass before coloring
+    def old_count_nodes(root):
+        if not root:
+            return 0
+        return 1 + old_count_nodes(root.left) + old_count_nodes(root.right)
+
+    def old_bfs_with_colors(root):
+        queue = deque([root])
+        visited = {}
+        step = 0
+        total_nodes = old_count_nodes(root)
+        while queue:
+            node = queue.popleft()
+            if node.id not in visited:
+                visited[node.id] = True
+                node.color = generate_color_gradient(step, total_nodes - 1)
+                step += 1
+                if node.left:
+                    queue.append(node.left)
+                if node.right:
+                    queue.append(node.right)
+
+    for name, node_class, traverse in (("uuid + visited dict", UuidNode, old_bfs_with_colors),
+                                       ("slots + generators", Node, bfs_with_colors)):
+        tracemalloc.start()
+        root = build_complete_tree(n, node_class)
+        tree_memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        traverse(root)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<20} tree {tree_memory / 2 ** 20:7.1f} MiB   bfs coloring {elapsed:6.2f} s")
+        del root
+
 def visualize_traversals():
     # Create and visualize BFS traversal
     bfs_tree = create_sample_tree()
@@ -1,3 +1,7 @@
+from collections import OrderedDict
+
+import numpy as np
+
 def greedy_algorithm(items, budget):
     """
     Greedy approach to maximize calories within budget
@@ -25,11 +29,17 @@ def greedy_algorithm(items, budget):
 
     return selected_items, total_cost, total_calories
 
-def dynamic_programming(items, budget):
+def dynamic_programming(items, budget, compact=False):
     """
     Dynamic programming approach to maximize calories within budget
     Returns (selected_items, total_cost, total_calories)
+
+    With compact=True only one row of the table is kept, see
+    dynamic_programming_compact.
     """
+    if compact:
+        return dynamic_programming_compact(items, budget)
+
     # Create DP table
     dp = [[0 for _ in range(budget + 1)] for _ in range(len(items) + 1)]
 
@@ -63,8 +73,195 @@ def dynamic_programming(items, budget):
 
     return selected_items, total_cost, total_calories
 
-def compare_algorithms(items, budget):
-    """Compare results of both algorithms"""
+def dynamic_programming_compact(items, budget):
+    """
+    Same result as dynamic_programming using O(budget) memory for values.
+
+    A single row is updated in place from high to low budgets, and each
+    item records its take/skip decisions as one bit per budget in a packed
+    bytearray (n * budget / 8 bytes instead of n * budget Python ints).
+    Walking those bits backwards recovers the selected items.
+    """
+    row = [0] * (budget + 1)
+    taken = []
+
+    for item_name, item_data in items.items():
+        cost = item_data["cost"]
+        calories = item_data["calories"]
+        bits = bytearray((budget >> 3) + 1)
+        # Going downwards means row[w - cost] still holds the previous row
+        for w in range(budget, cost - 1, -1):
+            candidate = row[w - cost] + calories
+            if candidate > row[w]:
+                row[w] = candidate
+                bits[w >> 3] |= 1 << (w & 7)
+        taken.append(bits)
+
+    # Backtrack through the decision bits
+    items_list = list(items.items())
+    selected_items = []
+    total_calories = row[budget]
+    total_cost = 0
+    w = budget
+
+    for i in range(len(items_list) - 1, -1, -1):
+        if taken[i][w >> 3] >> (w & 7) & 1:
+            item_name, item_data = items_list[i]
+            selected_items.append(item_name)
+            w -= item_data["cost"]
+            total_cost += item_data["cost"]
+
+    return selected_items, total_cost, total_calories
+
+def calories_dtype(items):
+    """
+    Smallest signed integer dtype that can hold the total of all calories,
+    or float64 when some calories are not integers.
+    """
+    calories = [data["calories"] for data in items.values()]
+    if not all(isinstance(value, (int, np.integer)) for value in calories):
+        return np.float64
+    total = sum(abs(value) for value in calories)
+    for dtype in (np.int16, np.int32, np.int64):
+        if total <= np.iinfo(dtype).max:
+            return dtype
+    raise OverflowError("calorie totals do not fit in 64 bits")
+
+def _knapsack_rows(items, budget):
+    """Final DP row and packed take/skip bits per item, one array op per item"""
+    row = np.zeros(budget + 1, dtype=calories_dtype(items))
+    mask = np.zeros(budget + 1, dtype=bool)
+    taken = []
+
+    for item_name, item_data in items.items():
+        cost = item_data["cost"]
+        mask[:] = False
+        if cost <= budget:
+            # candidate is a fresh array, so updating row in place is safe
+            candidate = row[:budget + 1 - cost] + item_data["calories"]
+            np.greater(candidate, row[cost:], out=mask[cost:])
+            np.maximum(row[cost:], candidate, out=row[cost:])
+        taken.append(np.packbits(mask, bitorder="little"))
+
+    return row, taken
+
+def _backtrack(items_list, taken, budget):
+    """Walk packed decision bits back from budget, returns (selected_items, total_cost)"""
+    selected_items = []
+    total_cost = 0
+    w = budget
+
+    for i in range(len(items_list) - 1, -1, -1):
+        if taken[i][w >> 3] >> (w & 7) & 1:
+            item_name, item_data = items_list[i]
+            selected_items.append(item_name)
+            w -= item_data["cost"]
+            total_cost += item_data["cost"]
+
+    return selected_items, total_cost
+
+def dynamic_programming_numpy(items, budget):
+    """
+    Vectorized dynamic_programming with the same results.
+
+    Each item updates the whole row with one shifted elementwise maximum
+    over a contiguous integer buffer sized by calories_dtype. Take/skip
+    decisions are packed with np.packbits, as in dynamic_programming_compact.
+    """
+    row, taken = _knapsack_rows(items, budget)
+    selected_items, total_cost = _backtrack(list(items.items()), taken, budget)
+    return selected_items, total_cost, row[budget].item()
+
+class KnapsackIndex:
+    """
+    Answers knapsack queries for every budget up to max_budget from one DP pass.
+
+    Column w of the table only depends on columns <= w, so the final row
+    already holds the optimum for each smaller budget, and backtracking
+    the decision bits from w gives the same items as
+    dynamic_programming(items, w). Use KnapsackIndex.get to share indexes
+    between calls on the same catalog.
+    """
+    _cache = OrderedDict()
+    cache_size = 32
+
+    def __init__(self, items, max_budget):
+        self.items_list = list(items.items())
+        self.max_budget = max_budget
+        self.row, self.taken = _knapsack_rows(items, max_budget)
+
+    @staticmethod
+    def catalog_key(items):
+        """Hashable key of the catalog; item order matters for tie-breaking"""
+        return tuple((name, data["cost"], data["calories"]) for name, data in items.items())
+
+    @classmethod
+    def get(cls, items, max_budget):
+        """Cached index for this catalog, rebuilt only if max_budget grows"""
+        key = cls.catalog_key(items)
+        index = cls._cache.get(key)
+        if index is None or index.max_budget < max_budget:
+            index = cls(items, max_budget)
+            cls._cache[key] = index
+            if len(cls._cache) > cls.cache_size:
+                cls._cache.popitem(last=False)
+        cls._cache.move_to_end(key)
+        return index
+
+    def _check(self, budget):
+        if not 0 <= budget <= self.max_budget:
+            raise ValueError(f"budget {budget} outside 0..{self.max_budget}")
+
+    def best(self, budget):
+        """Maximum calories within budget, O(1)"""
+        self._check(budget)
+        return self.row[budget].item()
+
+    def items_for(self, budget):
+        """Items selected for budget, O(n)"""
+        self._check(budget)
+        return _backtrack(self.items_list, self.taken, budget)[0]
+
+    def solve(self, budget):
+        """Same (selected_items, total_cost, total_calories) as dynamic_programming"""
+        self._check(budget)
+        selected_items, total_cost = _backtrack(self.items_list, self.taken, budget)
+        return selected_items, total_cost, self.row[budget].item()
+
+def benchmark_dynamic_programming(budgets=(10 ** 4, 10 ** 5, 10 ** 6), n_items=10, seed=0):
+    """Time dynamic_programming against its compact and NumPy variants"""
+    import random
+    import time
+
+    rng = random.Random(seed)
+    solvers = [
+        ("table", dynamic_programming),
+        ("compact", dynamic_programming_compact),
+        ("numpy", dynamic_programming_numpy),
+    ]
+
+    print(f"{'budget':>8} {'table (s)':>10} {'compact (s)':>12} {'numpy (s)':>10} {'speedup':>8}")
+    for budget in budgets:
+        # Prices in cents, so the budget covers a handful of items
+        items = {
+            f"item-{i}": {
+                "cost": rng.randint(budget // 20, budget // 2),
+                "calories": rng.randint(50, 1500),
+            }
+            for i in range(n_items)
+        }
+        timings = []
+        results = []
+        for name, solver in solvers:
+            start = time.perf_counter()
+            results.append(solver(items, budget))
+            timings.append(time.perf_counter() - start)
+        assert results[0] == results[1] == results[2]
+        print(f"{budget:>8} {timings[0]:>10.3f} {timings[1]:>12.3f} {timings[2]:>10.4f} "
+              f"{timings[0] / timings[2]:>7.0f}x")
+
+def compare_algorithms(items, budget, index=None):
+    """Compare results of both algorithms, reusing a KnapsackIndex if given"""
     print(f"\nComparing algorithms with budget: ${budget}")
     print("-" * 50)
 
@@ -76,7 +273,10 @@ def compare_algorithms(items, budget):
     print(f"Total calories: {greedy_calories}")
 
     # Run dynamic programming
-    dp_items, dp_cost, dp_calories = dynamic_programming(items, budget)
+    if index is not None:
+        dp_items, dp_cost, dp_calories = index.solve(budget)
+    else:
+        dp_items, dp_cost, dp_calories = dynamic_programming(items, budget)
     print("\nDynamic Programming Results:")
     print(f"Selected items: {dp_items}")
     print(f"Total cost: ${dp_cost}")
@@ -105,9 +305,11 @@ def run_tests():
     }
 
     # Test with different budgets
+    # One DP pass answers every budget
     budgets = [50, 100, 150]
+    index = KnapsackIndex.get(items, max(budgets))
     for budget in budgets:
-        compare_algorithms(items, budget)
+        compare_algorithms(items, budget, index)
 
 if __name__ == "__main__":
     run_tests()
\ No newline at end of file